@@ -1,12 +1,24 @@
 """Shared dataclasses describing hardware, runtime, and per-layer execution."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+import math
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional
 
+BYTES_PER_GB = 1e9
+# Unit conversions folded into one factor so each timing helper is a single multiply:
+# ms per FLOP at 1 TFLOP/s (1e3 / 1e12) and ms per byte at 1 GB/s (1e3 / 1e9).
+MS_PER_FLOP_AT_1_TFLOPS = 1e-9
+MS_PER_BYTE_AT_1_GBPS = 1e-6
 
-@dataclass(frozen=True)
-class HardwareSpec:
+
+class _HardwareRates:
+    # Slots for HardwareSpec's cached rates, kept out of its dataclass fields and asdict().
+    __slots__ = ("_ms_per_flop", "_ms_per_mem_byte", "_ms_per_ic_byte", "_overlap_eff")
+
+
+@dataclass(frozen=True, slots=True)
+class HardwareSpec(_HardwareRates):
     """Hardware capabilities used to convert analytic work into timing."""
 
     name: str
@@ -17,20 +29,35 @@ class HardwareSpec:
     max_concurrency: int = 1
     overlap_efficiency: float = 1.0
 
+    def __post_init__(self) -> None:
+        # Milliseconds per FLOP/byte cached at construction; inf/0.0 sentinels mirror the
+        # zero-capacity behaviour of the timing helpers in core.ops.metrics.
+        tflops = self.compute_throughput_tflops()
+        mem_gbps = max(self.memory_bandwidth_gbps, 0.0)
+        ic_gbps = max(self.interconnect_gbps, 0.0)
+        object.__setattr__(self, "_ms_per_flop", MS_PER_FLOP_AT_1_TFLOPS / tflops if tflops > 0 else math.inf)
+        object.__setattr__(self, "_ms_per_mem_byte", MS_PER_BYTE_AT_1_GBPS / mem_gbps if mem_gbps > 0 else math.inf)
+        object.__setattr__(self, "_ms_per_ic_byte", MS_PER_BYTE_AT_1_GBPS / ic_gbps if ic_gbps > 0 else 0.0)
+        object.__setattr__(self, "_overlap_eff", self.effective_overlap())
+
+    def __reduce__(self):
+        # Copies and pickles go back through __init__ so the cached rates are recomputed.
+        return (type(self), tuple(getattr(self, spec.name) for spec in fields(self)))
+
     def compute_throughput_tflops(self) -> float:
         return max(self.peak_tflops, 0.0)
 
     def memory_bandwidth_bytes(self) -> float:
-        return max(self.memory_bandwidth_gbps, 0.0) * 1e9
+        return max(self.memory_bandwidth_gbps, 0.0) * BYTES_PER_GB
 
     def interconnect_bandwidth_bytes(self) -> float:
-        return max(self.interconnect_gbps, 0.0) * 1e9
+        return max(self.interconnect_gbps, 0.0) * BYTES_PER_GB
 
     def effective_overlap(self) -> float:
         return max(self.overlap_efficiency, 1e-3)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RuntimeSpec:
     """Runtime overrides supplied through the CLI."""
 
@@ -66,8 +93,13 @@ class CommunicationLayerConfig(BaseLayerConfig):
     comm_config: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
-class LayerExecution:
+class _DeferredSources:
+    # Slots for ``LayerExecution.deferred`` sources, kept out of its dataclass fields and asdict().
+    __slots__ = ("_features_source", "_breakdown_source")
+
+
+@dataclass(slots=True)
+class LayerExecution(_DeferredSources):
     """Structured result emitted by analytic/ML estimators."""
 
     layer_name: str
@@ -81,6 +113,56 @@ class LayerExecution:
     estimated_execution_time_ms: float
     features: Dict[str, float] = field(default_factory=dict)
     breakdown: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # bytes_read + bytes_written, computed once at construction for reporting/aggregation.
+    bytes_total: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.bytes_total = self.bytes_read + self.bytes_written
+
+    @classmethod
+    def deferred(
+        cls,
+        layer_name: str,
+        layer_type: str,
+        flops: float,
+        bytes_read: float,
+        bytes_written: float,
+        compute_time_ms: float,
+        memory_time_ms: float,
+        dominant_latency_ms: float,
+        features_source: Dict[str, float],
+        breakdown_source: Any,
+    ) -> "LayerExecution":
+        """Build a record whose ``features``/``breakdown`` dicts are materialized on first access.
+
+        ``features_source`` is copied and ``breakdown_source.breakdown()`` (e.g. a
+        ``FusionMetricsBatch``) is called only if the fields are read, so sweeps that just
+        consume latencies skip the per-layer dict construction.
+        """
+        execution = cls.__new__(cls)
+        execution.layer_name = layer_name
+        execution.layer_type = layer_type
+        execution.flops = flops
+        execution.bytes_read = bytes_read
+        execution.bytes_written = bytes_written
+        execution.bytes_total = bytes_read + bytes_written
+        execution.compute_time_ms = compute_time_ms
+        execution.memory_time_ms = memory_time_ms
+        execution.dominant_latency_ms = dominant_latency_ms
+        execution.estimated_execution_time_ms = dominant_latency_ms
+        execution._features_source = features_source
+        execution._breakdown_source = breakdown_source
+        return execution
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for unset slots, i.e. the deferred fields of a ``deferred`` record.
+        if name == "features":
+            self.features = value = dict(self._features_source)
+            return value
+        if name == "breakdown":
+            self.breakdown = value = self._breakdown_source.breakdown()
+            return value
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -93,12 +175,12 @@ class LayerExecution:
             "memory_time_ms": self.memory_time_ms,
             "dominant_latency_ms": self.dominant_latency_ms,
             "estimated_execution_time_ms": self.estimated_execution_time_ms,
-            "features": dict(self.features),
-            "breakdown": dict(self.breakdown),
+            "features": self.features.copy(),
+            "breakdown": self.breakdown.copy(),
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResult:
     """Aggregate output for an end-to-end simulation run."""
 
@@ -108,11 +190,19 @@ class SimulationResult:
     peak_memory_bytes: float
     bottleneck_layer: Optional[str]
 
-    def to_dict(self) -> Dict[str, Any]:
+    def iter_layer_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield each layer's ``to_dict()`` lazily, e.g. for streaming serializers."""
+        for layer in self.layers:
+            yield layer.to_dict()
+
+    def totals(self) -> Dict[str, Any]:
+        """Every ``to_dict()`` entry except ``layers``."""
         return {
-            "layers": [layer.to_dict() for layer in self.layers],
             "total_flops": self.total_flops,
             "total_latency_ms": self.total_latency_ms,
             "peak_memory_bytes": self.peak_memory_bytes,
             "bottleneck_layer": self.bottleneck_layer,
         }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"layers": [layer.to_dict() for layer in self.layers], **self.totals()}
@@ -1,4 +1,5 @@
 """Estimator backends."""
 from .analytic import AnalyticEstimator
+from .compiled import CompiledModel
 
-__all__ = ["AnalyticEstimator"]
+__all__ = ["AnalyticEstimator", "CompiledModel"]
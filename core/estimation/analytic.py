@@ -1,7 +1,9 @@
 """Analytic estimator backend that wraps layer modules."""
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
 
 from core.data import (
     BaseLayerConfig,
@@ -13,6 +15,223 @@ from core.data import (
     RuntimeSpec,
 )
 from core.module import Attention, Communication, FFN, MoE
+from core.module.attention import AttentionConfig
+from core.module.communication import CommunicationConfig
+from core.module.ffn import FFNConfig
+from core.module.moe import MoEConfig
+from core.ops import FusionMetricsBatch, tensor_bytes_many
+
+from .compiled import CompiledModel
+
+
+# Vectorized mirrors of the fused-op formulas in core.ops.fused_ops. Each helper takes
+# per-layer geometry arrays plus a representative config for the structural flags shared
+# by the group, and returns [(op_name, flops, bytes_accessed), ...].
+OpArrays = List[Tuple[str, np.ndarray, np.ndarray]]
+
+
+def _bytes_np(*dims: np.ndarray, bits: np.ndarray) -> np.ndarray:
+    # One tensor template across every layer in the group: an (N, rank) shape matrix.
+    return tensor_bytes_many(np.stack(dims, axis=-1), bits)
+
+
+def _dequant_flops_np(weight_elements: np.ndarray, weight_bits: np.ndarray, bits: np.ndarray) -> np.ndarray:
+    return np.where(weight_bits < bits, 2.0 * weight_elements, 0.0)
+
+
+def _attention_flops_bytes_np(arrs: Dict[str, np.ndarray], cfg: Any) -> OpArrays:
+    batch, seq, bits = arrs["batch"], arrs["seq"], arrs["dtype_bits"]
+    weight_bits, kv_bits = arrs["weight_bits"], arrs["kv_bits"]
+    d_model, num_heads, head_dim = arrs["d_model"], arrs["num_heads"], arrs["head_dim"]
+    tokens = batch * seq
+    qkv_dim = num_heads * head_dim
+
+    qkv_flops = 3.0 * (2 * tokens * qkv_dim * d_model) + _dequant_flops_np(3 * d_model * qkv_dim, weight_bits, bits)
+    input_bytes = _bytes_np(batch, seq, d_model, bits=bits)
+    if cfg.fused_qkv:
+        qkv_name = "attention_qkv_proj_fused"
+        qkv_bytes = (
+            input_bytes
+            + _bytes_np(d_model, 3 * qkv_dim, bits=weight_bits)
+            + (_bytes_np(batch, seq, qkv_dim, bits=bits) + _bytes_np(batch, seq, 2 * qkv_dim, bits=kv_bits))
+        )
+    else:
+        qkv_name = "attention_qkv_proj"
+        qkv_bytes = (
+            input_bytes * 3
+            + _bytes_np(d_model, qkv_dim, bits=weight_bits) * 3
+            + (_bytes_np(batch, seq, qkv_dim, bits=bits) + _bytes_np(batch, seq, qkv_dim, bits=kv_bits) * 2)
+        )
+
+    out_flops = 2 * tokens * d_model * qkv_dim + _dequant_flops_np(qkv_dim * d_model, weight_bits, bits)
+    out_bytes = (
+        _bytes_np(batch, seq, qkv_dim, bits=bits)
+        + _bytes_np(qkv_dim, d_model, bits=weight_bits)
+        + _bytes_np(batch, seq, d_model, bits=bits)
+    )
+
+    head_bytes = _bytes_np(batch, num_heads, seq, head_dim, bits=bits)
+    kv_head_bytes = _bytes_np(batch, num_heads, seq, head_dim, bits=kv_bits)
+    qk_flops = (2 * seq * seq * head_dim) * batch * num_heads
+    softmax_flops = batch * num_heads * seq * seq
+    av_flops = (2 * seq * head_dim * seq) * batch * num_heads
+    context_bytes = _bytes_np(batch, seq, qkv_dim, bits=bits)
+    # Mirrors attention._metrics_fused: Q/K/V reads are elided from level 1, the context
+    # round trip into the output projection from level 2.
+    level = cfg.kernel_fusion_level
+    onchip_context = context_bytes if level >= 2 else 0.0
+    if level >= 2:
+        out_bytes = out_bytes - onchip_context
+    if cfg.fused_attention:
+        flash_flops = qk_flops + softmax_flops + av_flops
+        flash_bytes = head_bytes + kv_head_bytes + kv_head_bytes + context_bytes
+        if level > 0:
+            flash_bytes = flash_bytes - (head_bytes + kv_head_bytes + kv_head_bytes + onchip_context)
+        return [
+            (qkv_name, qkv_flops, qkv_bytes),
+            ("attention_flash", flash_flops, flash_bytes),
+            ("attention_output_proj", out_flops, out_bytes),
+        ]
+
+    attn_bytes = _bytes_np(batch, num_heads, seq, seq, bits=bits)
+    scores_bytes = head_bytes + kv_head_bytes + attn_bytes
+    weighted_bytes = attn_bytes + kv_head_bytes + context_bytes
+    if level > 0:
+        scores_bytes = scores_bytes - (head_bytes + kv_head_bytes)
+        weighted_bytes = weighted_bytes - (kv_head_bytes + onchip_context)
+    return [
+        (qkv_name, qkv_flops, qkv_bytes),
+        ("attention_scores", qk_flops + softmax_flops, scores_bytes),
+        ("attention_weighted_sum", av_flops, weighted_bytes),
+        ("attention_output_proj", out_flops, out_bytes),
+    ]
+
+
+def _ffn_flops_bytes_np(arrs: Dict[str, np.ndarray], cfg: Any) -> OpArrays:
+    batch, seq, bits = arrs["batch"], arrs["seq"], arrs["dtype_bits"]
+    d_model, hidden, weight_bits = arrs["d_model"], arrs["d_ff"], arrs["weight_bits"]
+    tokens = batch * seq
+    activation_flops = tokens * hidden
+    if cfg.activation != "swiglu":
+        dequant_flops = _dequant_flops_np(2 * d_model * hidden, weight_bits, bits)
+        flops = 2 * tokens * hidden * d_model + 2 * tokens * d_model * hidden + activation_flops + dequant_flops
+        bytes_accessed = (
+            _bytes_np(batch, seq, d_model, bits=bits)
+            + _bytes_np(batch, seq, hidden, bits=bits) * 2
+            + (_bytes_np(d_model, hidden, bits=weight_bits) + _bytes_np(hidden, d_model, bits=weight_bits))
+        )
+        if cfg.kernel_fusion_level > 0:
+            bytes_accessed = bytes_accessed - _bytes_np(batch, seq, hidden, bits=bits) * 2
+        return [("ffn", flops, bytes_accessed)]
+
+    dequant_flops = _dequant_flops_np(3 * d_model * hidden, weight_bits, bits)
+    flops = 2 * (2 * tokens * hidden * d_model) + 2 * tokens * d_model * hidden + activation_flops + dequant_flops
+    if cfg.gate_fused:
+        bytes_accessed = (
+            _bytes_np(batch, seq, d_model, bits=bits)
+            + _bytes_np(batch, seq, 2 * hidden, bits=bits) * 2
+            + (_bytes_np(d_model, 2 * hidden, bits=weight_bits) + _bytes_np(hidden, d_model, bits=weight_bits))
+        )
+        if cfg.kernel_fusion_level > 0:
+            bytes_accessed = bytes_accessed - _bytes_np(batch, seq, 2 * hidden, bits=bits) * 2
+        return [("ffn_swiglu_fused", flops, bytes_accessed)]
+    bytes_accessed = (
+        _bytes_np(batch, seq, d_model, bits=bits) * 2
+        + _bytes_np(batch, seq, hidden, bits=bits) * 6
+        + (_bytes_np(d_model, hidden, bits=weight_bits) * 2 + _bytes_np(hidden, d_model, bits=weight_bits))
+    )
+    if cfg.kernel_fusion_level > 0:
+        bytes_accessed = bytes_accessed - _bytes_np(batch, seq, hidden, bits=bits) * 6
+    return [("ffn_swiglu", flops, bytes_accessed)]
+
+
+def _moe_flops_bytes_np(arrs: Dict[str, np.ndarray], cfg: Any) -> OpArrays:
+    batch, seq, bits = arrs["batch"], arrs["seq"], arrs["dtype_bits"]
+    d_model, hidden, weight_bits = arrs["d_model"], arrs["expert_hidden"], arrs["weight_bits"]
+    num_experts, top_k = arrs["num_experts"], arrs["top_k"]
+    tokens = batch * seq
+
+    routing_flops = tokens * num_experts + tokens * top_k
+    routing_bytes = _bytes_np(tokens, num_experts, bits=bits)
+
+    # NaN marks layers without a runtime tokens_per_expert override.
+    tokens_per_expert = arrs["tokens_per_expert"]
+    active = np.floor(
+        np.where(np.isnan(tokens_per_expert), tokens * arrs["avg_experts_per_token"], tokens_per_expert * num_experts)
+    )
+    expert_flops = (
+        2 * active * hidden * d_model
+        + 2 * active * d_model * hidden
+        + active * hidden
+        + _dequant_flops_np(2 * d_model * hidden, weight_bits, bits)
+    )
+    expert_bytes = (
+        _bytes_np(active, d_model, bits=bits)
+        + _bytes_np(active, hidden, bits=bits)
+        + (_bytes_np(d_model, hidden, bits=weight_bits) + _bytes_np(hidden, d_model, bits=weight_bits))
+    )
+
+    comm_bytes = _bytes_np(active, d_model, bits=bits) / arrs["num_groups"]
+    return [
+        ("moe_routing", routing_flops, routing_bytes),
+        ("moe_expert", expert_flops, expert_bytes),
+        ("all_to_all", np.zeros_like(comm_bytes), comm_bytes),
+    ]
+
+
+def _module_arrays(module_cls: type, modules: Sequence[Any], batch: int, seq: int) -> Dict[str, np.ndarray]:
+    if module_cls is Attention:
+        fields = {
+            "d_model": [m.config.d_model for m in modules],
+            "num_heads": [m.config.num_heads for m in modules],
+            "head_dim": [m.config.resolved_head_dim for m in modules],
+            "kv_bits": [m.config.resolved_kv_bits for m in modules],
+        }
+    elif module_cls is FFN:
+        fields = {
+            "d_model": [m.config.d_model for m in modules],
+            "d_ff": [m.config.d_ff for m in modules],
+        }
+    else:
+        fields = {
+            "d_model": [m.config.d_model for m in modules],
+            "expert_hidden": [m.config.expert_hidden for m in modules],
+            "num_experts": [m.config.num_experts for m in modules],
+            "top_k": [m.config.top_k for m in modules],
+            "avg_experts_per_token": [m.config.avg_experts_per_token for m in modules],
+            "num_groups": [m.config.num_groups for m in modules],
+            "tokens_per_expert": [np.nan if m.tokens_per_expert is None else m.tokens_per_expert for m in modules],
+        }
+    fields["dtype_bits"] = [m.config.dtype_bits for m in modules]
+    fields["weight_bits"] = [m.config.resolved_weight_bits for m in modules]
+    arrs = {key: np.asarray(values, dtype=np.float64) for key, values in fields.items()}
+    arrs["batch"] = np.full(len(modules), float(batch))
+    arrs["seq"] = np.full(len(modules), float(seq))
+    return arrs
+
+
+_BATCHED_OPS = {
+    Attention: _attention_flops_bytes_np,
+    FFN: _ffn_flops_bytes_np,
+    MoE: _moe_flops_bytes_np,
+}
+
+# Config flags that change which ops are emitted; layers are only batched together when these match.
+_STRUCTURAL_FIELDS = {
+    Attention: ("fused_qkv", "fused_attention", "kernel_fusion_level"),
+    FFN: ("activation", "gate_fused", "kernel_fusion_level"),
+    MoE: (),
+}
+
+
+# Layer config type -> (module class, attribute holding that module's config dict).
+_LAYER_DISPATCH: Dict[type, Tuple[type, type, str]] = {
+    FFNLayerConfig: (FFN, FFNConfig, "ffn_config"),
+    MoELayerConfig: (MoE, MoEConfig, "moe_config"),
+    CommunicationLayerConfig: (Communication, CommunicationConfig, "comm_config"),
+    BaseLayerConfig: (Attention, AttentionConfig, "attn_config"),
+}
+_EMPTY_CONFIG: Dict[str, Any] = {}
 
 
 class AnalyticEstimator:
@@ -21,23 +240,49 @@ class AnalyticEstimator:
     def __init__(self, hardware: HardwareSpec, runtime: RuntimeSpec):
         self.hardware = hardware
         self.runtime = runtime
+        # Decoder stacks repeat the same geometry, so share one module per distinct parsed config.
+        self._modules: Dict[Any, Any] = {}
+        self._dispatch: Dict[type, Tuple[type, type, str]] = dict(_LAYER_DISPATCH)
+        # (config class, id(source dict)) -> (source, snapshot, parsed config).
+        self._parsed: Dict[Tuple[type, int], Tuple[Any, Dict[str, Any], Any]] = {}
+
+    def _module_config(self, config_cls: type, source: Any) -> Any:
+        key = (config_cls, id(source))
+        cached = self._parsed.get(key)
+        # Holding ``source`` keeps its id from being reused; the snapshot catches in-place edits.
+        if cached is not None and cached[1] == source:
+            return cached[2]
+        config = config_cls.from_dict(source)
+        self._parsed[key] = (source, dict(source), config)
+        return config
+
+    def _layer_module(self, layer_config: BaseLayerConfig) -> Any:
+        config_cls = type(layer_config)
+        entry = self._dispatch.get(config_cls)
+        if entry is None:
+            # Subclasses resolve through their MRO once, then hit the table directly.
+            entry = next(
+                (_LAYER_DISPATCH[klass] for klass in config_cls.__mro__ if klass in _LAYER_DISPATCH),
+                _LAYER_DISPATCH[BaseLayerConfig],
+            )
+            self._dispatch[config_cls] = entry
+        module_cls, module_config_cls, attr = entry
+        config = self._module_config(module_config_cls, getattr(layer_config, attr) or _EMPTY_CONFIG)
+        module = self._modules.get(config)
+        if module is None:
+            if module_cls is MoE:
+                module = MoE.from_config(config, runtime=self.runtime)
+            else:
+                module = module_cls.from_config(config)
+            self._modules[config] = module
+        return module
 
     def estimate_layer(self, layer_config: BaseLayerConfig) -> LayerExecution:
         batch = self.runtime.batch_size
         seq = self.runtime.seq_len
 
-        if isinstance(layer_config, FFNLayerConfig):
-            module = FFN(layer_config.ffn_config)
-            execution = module.estimate_execution_time(batch, seq, self.hardware)
-        elif isinstance(layer_config, MoELayerConfig):
-            module = MoE(layer_config.moe_config)
-            execution = module.estimate_execution_time(batch, seq, self.hardware)
-        elif isinstance(layer_config, CommunicationLayerConfig):
-            module = Communication(layer_config.comm_config)
-            execution = module.estimate_execution_time(batch, seq, self.hardware)
-        else:
-            module = Attention(layer_config.attn_config)
-            execution = module.estimate_execution_time(batch, seq, self.hardware)
+        module = self._layer_module(layer_config)
+        execution = module.estimate_execution_time(batch, seq, self.hardware)
 
         execution.layer_name = layer_config.name
         execution.layer_type = layer_config.layer_type
@@ -47,3 +292,97 @@ class AnalyticEstimator:
 
     def estimate_layers(self, layer_configs: List[BaseLayerConfig]) -> List[LayerExecution]:
         return [self.estimate_layer(config) for config in layer_configs]
+
+    def iter_layers(self, layer_configs: Iterable[BaseLayerConfig]) -> Iterator[LayerExecution]:
+        """Yield one ``LayerExecution`` per config, estimated on demand."""
+        for config in layer_configs:
+            yield self.estimate_layer(config)
+
+    def compile(self, layer_configs: Sequence[BaseLayerConfig]) -> CompiledModel:
+        """Precompute hardware-independent FLOPs/bytes for ``layer_configs`` at this runtime shape."""
+        batch = self.runtime.batch_size
+        seq = self.runtime.seq_len
+        count = len(layer_configs)
+        flops = np.zeros(count)
+        bytes_read = np.zeros(count)
+        bytes_written = np.zeros(count)
+        memory_bytes = np.zeros(count)
+        interconnect_bound = np.zeros(count, dtype=bool)
+        breakdowns: List[FusionMetricsBatch | None] = [None] * count
+        features: List[Dict[str, float] | None] = [None] * count
+
+        # Repeated decoder blocks share one module per distinct geometry, so each module is
+        # evaluated once and its row is scattered to every layer that uses it.
+        rows_by_module: Dict[Any, List[int]] = {}
+        for idx, layer_config in enumerate(layer_configs):
+            module = self._layer_module(layer_config)
+            layer_features = module.features(batch, seq)
+            layer_features.setdefault("layer_id", float(layer_config.layer_id))
+            layer_features.setdefault("layer_type", 0.0)
+            features[idx] = layer_features
+            rows = rows_by_module.get(module)
+            if rows is None:
+                rows_by_module[module] = [idx]
+            else:
+                rows.append(idx)
+
+        groups: Dict[Tuple[type, Tuple[Any, ...]], List[Any]] = {}
+        for module, rows in rows_by_module.items():
+            module_cls = type(module)
+            if module_cls not in _BATCHED_OPS:
+                # Communication: a single bandwidth-bound transfer, timed on the interconnect.
+                metric = module._metrics(batch, seq)
+                bytes_read[rows] = bytes_written[rows] = memory_bytes[rows] = metric.bytes_accessed
+                interconnect_bound[rows] = True
+                breakdown = FusionMetricsBatch.from_metrics((metric,))
+                for idx in rows:
+                    breakdowns[idx] = breakdown
+                continue
+            structure = tuple(getattr(module.config, name) for name in _STRUCTURAL_FIELDS[module_cls])
+            groups.setdefault((module_cls, structure), []).append(module)
+
+        for (module_cls, _), modules in groups.items():
+            arrs = _module_arrays(module_cls, modules, batch, seq)
+            ops = _BATCHED_OPS[module_cls](arrs, modules[0].config)
+
+            names = tuple(name for name, _, _ in ops)
+            op_flops = np.stack([f for _, f, _ in ops], axis=1)
+            op_bytes = np.stack([b for _, _, b in ops], axis=1)
+            layer_flops = op_flops.sum(axis=1)
+            total_bytes = op_bytes.sum(axis=1)
+            output_bytes = _bytes_np(arrs["batch"], arrs["seq"], arrs["d_model"], bits=arrs["dtype_bits"])
+
+            module_rows = [rows_by_module[module] for module in modules]
+            rows = np.fromiter((idx for idxs in module_rows for idx in idxs), dtype=np.intp)
+            source = np.repeat(np.arange(len(modules)), [len(idxs) for idxs in module_rows])
+            flops[rows] = layer_flops[source]
+            bytes_read[rows] = total_bytes[source]
+            bytes_written[rows] = output_bytes[source]
+            memory_bytes[rows] = (total_bytes + output_bytes)[source]
+            for pos, idxs in enumerate(module_rows):
+                breakdown = FusionMetricsBatch(names, op_flops[pos], op_bytes[pos])
+                for idx in idxs:
+                    breakdowns[idx] = breakdown
+
+        return CompiledModel(
+            layer_names=tuple(config.name for config in layer_configs),
+            layer_types=tuple(config.layer_type for config in layer_configs),
+            flops=flops,
+            bytes_read=bytes_read,
+            bytes_written=bytes_written,
+            memory_bytes=memory_bytes,
+            interconnect_bound=interconnect_bound,
+            breakdowns=tuple(breakdowns),
+            features=tuple(features),
+        )
+
+    def estimate_layers_batched(self, layer_configs: Sequence[BaseLayerConfig]) -> List[LayerExecution]:
+        """Same results as ``estimate_layers``, computed through ``compile`` + ``evaluate``.
+
+        Each distinct layer geometry is evaluated once with NumPy and shared by every layer
+        that repeats it. This beats the scalar path on repeated decoder stacks and on cold
+        estimators; once warm over many distinct geometries, the memoized ``estimate_layers``
+        is faster. To time one workload against many hardware specs, ``compile`` once and call
+        ``CompiledModel.evaluate`` per spec.
+        """
+        return self.compile(layer_configs).evaluate(self.hardware)
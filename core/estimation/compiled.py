@@ -0,0 +1,54 @@
+"""Hardware-independent layer workloads that can be re-timed against many hardware specs."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.data import HardwareSpec, LayerExecution
+from core.ops import FusionMetricsBatch, layer_latencies_ms
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledModel:
+    """Per-layer FLOPs/bytes for a fixed layer list and (batch, seq), produced by ``AnalyticEstimator.compile``."""
+
+    layer_names: Tuple[str, ...]
+    layer_types: Tuple[str, ...]
+    flops: np.ndarray
+    bytes_read: np.ndarray
+    bytes_written: np.ndarray
+    # Bytes charged against HBM bandwidth (read + written, or the payload for communication).
+    memory_bytes: np.ndarray
+    # Layers whose "compute" time is interconnect transfer time (communication layers).
+    interconnect_bound: np.ndarray
+    breakdowns: Tuple[FusionMetricsBatch, ...]
+    features: Tuple[Dict[str, float], ...]
+
+    def __len__(self) -> int:
+        return len(self.layer_names)
+
+    def timings(self, hardware: HardwareSpec) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (compute_ms, memory_ms, dominant_ms) arrays for ``hardware``."""
+        return layer_latencies_ms(self.flops, self.memory_bytes, self.interconnect_bound, hardware)
+
+    def evaluate(self, hardware: HardwareSpec) -> List[LayerExecution]:
+        compute_ms, memory_ms, latency_ms = self.timings(hardware)
+        columns = zip(
+            self.layer_names,
+            self.layer_types,
+            self.flops.tolist(),
+            self.bytes_read.tolist(),
+            self.bytes_written.tolist(),
+            compute_ms.tolist(),
+            memory_ms.tolist(),
+            latency_ms.tolist(),
+            self.breakdowns,
+            self.features,
+        )
+        deferred = LayerExecution.deferred
+        return [
+            deferred(name, layer_type, flops, bytes_read, bytes_written, comp, mem, latency, features, breakdown)
+            for name, layer_type, flops, bytes_read, bytes_written, comp, mem, latency, breakdown, features in columns
+        ]
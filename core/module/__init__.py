@@ -1,7 +1,7 @@
 # Public  APIs
 from .attention import Attention
 from .communication import Communication
-from .moe import MoE  # main new class
-from .ffn import FFN  # wrapper that aliases FFN -> MoE
+from .moe import MoE
+from .ffn import FFN  # standalone dense FFN, not an alias of MoE
 
 __all__ = ["Attention", "FFN", "Communication", "MoE"]
\ No newline at end of file
@@ -2,30 +2,39 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from core.data import HardwareSpec, LayerExecution
 from core.ops import (
     FusionMetrics,
+    FusionMetricsBatch,
+    attention_flash,
     attention_output_projection,
     attention_qkv_projections,
     attention_scores,
     attention_weighted_sum,
-    compute_time_ms,
-    dominant_latency_ms,
-    memory_time_ms,
+    layer_times_ms,
     tensor_bytes,
 )
 
 DEFAULT_DTYPE_BITS = 16
 
 
-@dataclass
+@dataclass(frozen=True)
 class AttentionConfig:
     d_model: int = 768
     num_heads: int = 8
     head_dim: int | None = None
+    # dtype_bits is the activation width; weights and the KV cache default to it.
     dtype_bits: int = DEFAULT_DTYPE_BITS
+    weight_bits: int | None = None
+    kv_bits: int | None = None
+    fused_qkv: bool = True
+    fused_attention: bool = True
+    # 0: every op round-trips HBM; 1: attention reads Q/K/V straight from the projection
+    # epilogue; 2: additionally keeps the attention output on-chip for the output projection.
+    kernel_fusion_level: int = 0
 
     @classmethod
     def from_dict(cls, data: Dict) -> "AttentionConfig":
@@ -33,7 +42,12 @@ class AttentionConfig:
             d_model=int(data.get("d_model", 768)),
             num_heads=int(data.get("num_attention_heads", data.get("num_heads", 8))),
             head_dim=data.get("head_dim"),
-            dtype_bits=int(data.get("dtype_bits", DEFAULT_DTYPE_BITS)),
+            dtype_bits=int(data.get("activation_bits", data.get("dtype_bits", DEFAULT_DTYPE_BITS))),
+            weight_bits=data.get("weight_bits"),
+            kv_bits=data.get("kv_bits"),
+            fused_qkv=bool(data.get("fused_qkv", True)),
+            fused_attention=bool(data.get("fused_attention", True)),
+            kernel_fusion_level=min(max(int(data.get("kernel_fusion_level", 0)), 0), 2),
         )
 
     @property
@@ -42,45 +56,130 @@ class AttentionConfig:
             return int(self.head_dim)
         return self.d_model // max(self.num_heads, 1)
 
+    @property
+    def resolved_weight_bits(self) -> int:
+        return int(self.weight_bits) if self.weight_bits is not None else self.dtype_bits
+
+    @property
+    def resolved_kv_bits(self) -> int:
+        return int(self.kv_bits) if self.kv_bits is not None else self.dtype_bits
+
     @property
     def qkv_dim(self) -> int:
         return self.num_heads * self.resolved_head_dim
 
 
+@lru_cache(maxsize=None)
+def _attention_metrics(
+    d_model: int,
+    num_heads: int,
+    head_dim: int,
+    dtype_bits: int,
+    weight_bits: int,
+    kv_bits: int,
+    fused_qkv: bool,
+    fused_attention: bool,
+    kernel_fusion_level: int,
+    batch: int,
+    seq: int,
+) -> FusionMetricsBatch:
+    qkv_dim = num_heads * head_dim
+    qkv = attention_qkv_projections(
+        batch, seq, d_model, qkv_dim, dtype_bits=dtype_bits, weight_bits=weight_bits, kv_bits=kv_bits, fused=fused_qkv
+    )
+    out_proj = attention_output_projection(batch, seq, d_model, qkv_dim, dtype_bits=dtype_bits, weight_bits=weight_bits)
+    if fused_attention:
+        flash = attention_flash(batch, seq, num_heads, head_dim, dtype_bits=dtype_bits, kv_bits=kv_bits)
+        ops = [qkv, flash, out_proj]
+    else:
+        scores = attention_scores(batch, seq, num_heads, head_dim, dtype_bits=dtype_bits, kv_bits=kv_bits)
+        weighted = attention_weighted_sum(batch, seq, num_heads, head_dim, dtype_bits=dtype_bits, kv_bits=kv_bits)
+        ops = [qkv, scores, weighted, out_proj]
+    if kernel_fusion_level > 0:
+        ops = _metrics_fused(ops, batch, seq, num_heads, head_dim, dtype_bits, kv_bits, kernel_fusion_level)
+    return FusionMetricsBatch.from_metrics(ops)
+
+
+def _metrics_fused(
+    ops: List[FusionMetrics],
+    batch: int,
+    seq: int,
+    num_heads: int,
+    head_dim: int,
+    dtype_bits: int,
+    kv_bits: int,
+    kernel_fusion_level: int,
+) -> List[FusionMetrics]:
+    """Drop producer->consumer HBM round trips that a fused attention kernel keeps on-chip."""
+    q_bytes = tensor_bytes((batch, num_heads, seq, head_dim), dtype_bits)
+    kv_bytes = tensor_bytes((batch, num_heads, seq, head_dim), kv_bits)
+    context_bytes = tensor_bytes((batch, seq, num_heads * head_dim), dtype_bits) if kernel_fusion_level >= 2 else 0.0
+    qkv, *core_ops, out_proj = ops
+    if len(core_ops) == 1:
+        core_ops = [core_ops[0].without_bytes(q_bytes + kv_bytes + kv_bytes + context_bytes)]
+    else:
+        scores, weighted = core_ops
+        core_ops = [scores.without_bytes(q_bytes + kv_bytes), weighted.without_bytes(kv_bytes + context_bytes)]
+    return [qkv, *core_ops, out_proj.without_bytes(context_bytes)]
+
+
 class Attention:
     def __init__(self, attn_config: Dict, hardware_config: Dict | None = None):
-        self.config = AttentionConfig.from_dict(attn_config or {})
-        self.hardware_cfg = hardware_config or {}
+        self._setup(AttentionConfig.from_dict(attn_config or {}))
 
-    def _metrics(self, batch: int, seq: int) -> Tuple[FusionMetrics, ...]:
+    def _setup(self, config: AttentionConfig) -> None:
+        self.config = config
+        self._metrics_cache: Dict[Tuple[int, int], FusionMetricsBatch] = {}
+
+    @classmethod
+    def from_config(cls, config: AttentionConfig) -> "Attention":
+        """Build from an already-parsed config, skipping ``from_dict``."""
+        module = cls.__new__(cls)
+        module._setup(config)
+        return module
+
+    def _metrics(self, batch: int, seq: int) -> FusionMetricsBatch:
+        cached = self._metrics_cache.get((batch, seq))
+        if cached is not None:
+            return cached
         cfg = self.config
-        qkv = attention_qkv_projections(batch, seq, cfg.d_model, cfg.qkv_dim, dtype_bits=cfg.dtype_bits)
-        scores = attention_scores(batch, seq, cfg.num_heads, cfg.resolved_head_dim, dtype_bits=cfg.dtype_bits)
-        weighted = attention_weighted_sum(batch, seq, cfg.num_heads, cfg.resolved_head_dim, dtype_bits=cfg.dtype_bits)
-        out_proj = attention_output_projection(batch, seq, cfg.d_model, cfg.qkv_dim, dtype_bits=cfg.dtype_bits)
-        return qkv, scores, weighted, out_proj
+        metrics = _attention_metrics(
+            cfg.d_model,
+            cfg.num_heads,
+            cfg.resolved_head_dim,
+            cfg.dtype_bits,
+            cfg.resolved_weight_bits,
+            cfg.resolved_kv_bits,
+            cfg.fused_qkv,
+            cfg.fused_attention,
+            cfg.kernel_fusion_level,
+            batch,
+            seq,
+        )
+        self._metrics_cache[(batch, seq)] = metrics
+        return metrics
+
+    def features(self, batch: int, seq: int) -> Dict[str, float]:
+        return {
+            "d_model": float(self.config.d_model),
+            "num_heads": float(self.config.num_heads),
+            "batch": float(batch),
+            "seq": float(seq),
+            "dtype_bits": float(self.config.dtype_bits),
+        }
 
     def analytic_flops(self, batch: int, seq: int) -> float:
-        return sum(metric.flops for metric in self._metrics(batch, seq))
+        return self._metrics(batch, seq).total_flops
 
     def estimate_execution_time(self, batch: int, seq: int, hardware: HardwareSpec) -> LayerExecution:
         metrics = self._metrics(batch, seq)
-        total_flops = sum(m.flops for m in metrics)
-        total_bytes = sum(m.bytes_accessed for m in metrics)
+        total_flops = metrics.total_flops
+        total_bytes = metrics.total_bytes
         output_bytes = tensor_bytes((batch, seq, self.config.d_model), self.config.dtype_bits)
 
-        compute_ms = compute_time_ms(total_flops, hardware)
-        memory_ms = memory_time_ms(total_bytes + output_bytes, hardware)
-        latency_ms = dominant_latency_ms(compute_ms, memory_ms, hardware)
+        compute_ms, memory_ms, latency_ms = layer_times_ms(total_flops, total_bytes + output_bytes, hardware)
 
-        breakdown = {m.name: {"flops": m.flops, "bytes": m.bytes_accessed} for m in metrics}
-        features = {
-            "d_model": float(self.config.d_model),
-            "num_heads": float(self.config.num_heads),
-            "batch": float(batch),
-            "seq": float(seq),
-            "dtype_bits": float(self.config.dtype_bits),
-        }
+        breakdown = metrics.breakdown()
 
         return LayerExecution(
             layer_name="attention",
@@ -92,7 +191,7 @@ class Attention:
             memory_time_ms=memory_ms,
             dominant_latency_ms=latency_ms,
             estimated_execution_time_ms=latency_ms,
-            features=features,
+            features=self.features(batch, seq),
             breakdown=breakdown,
         )
 
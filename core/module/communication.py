@@ -6,6 +6,7 @@ from typing import Dict
 
 from core.data import HardwareSpec, LayerExecution
 from core.ops import (
+    FusionMetrics,
     communication_all_reduce,
     communication_all_to_all,
     dominant_latency_ms,
@@ -16,7 +17,7 @@ from core.ops import (
 DEFAULT_PAYLOAD_MB = 1.0
 
 
-@dataclass
+@dataclass(frozen=True)
 class CommunicationConfig:
     pattern: str = "all_to_all"
     payload_mb: float = DEFAULT_PAYLOAD_MB
@@ -31,31 +32,44 @@ class CommunicationConfig:
 
 class Communication:
     def __init__(self, communication_config: Dict, hardware_config: Dict | None = None):
-        self.config = CommunicationConfig.from_dict(communication_config or {})
-        self.hardware_cfg = hardware_config or {}
+        self._setup(CommunicationConfig.from_dict(communication_config or {}))
+
+    def _setup(self, config: CommunicationConfig) -> None:
+        self.config = config
+
+    @classmethod
+    def from_config(cls, config: CommunicationConfig) -> "Communication":
+        """Build from an already-parsed config, skipping ``from_dict``."""
+        module = cls.__new__(cls)
+        module._setup(config)
+        return module
+
+    def _metrics(self, batch: int, seq: int) -> FusionMetrics:
+        payload_bytes = self.config.payload_mb * 1e6
+        if self.config.pattern == "all_reduce":
+            return communication_all_reduce(payload_bytes)
+        return communication_all_to_all(payload_bytes)
+
+    def features(self, batch: int, seq: int) -> Dict[str, float]:
+        return {
+            "pattern": 1.0 if self.config.pattern == "all_reduce" else 0.0,
+            "payload_mb": float(self.config.payload_mb),
+            "batch": float(batch),
+            "seq": float(seq),
+        }
 
     def analytic_flops(self, batch: int, seq: int) -> int:
         # Communication is assumed to be bandwidth bound; no meaningful FLOPs.
         return 0
 
     def estimate_execution_time(self, batch: int, seq: int, hardware: HardwareSpec) -> LayerExecution:
-        payload_bytes = self.config.payload_mb * 1e6
-        if self.config.pattern == "all_reduce":
-            metric = communication_all_reduce(payload_bytes)
-        else:
-            metric = communication_all_to_all(payload_bytes)
+        metric = self._metrics(batch, seq)
 
         interconnect_ms = interconnect_time_ms(metric.bytes_accessed, hardware)
         memory_ms = memory_time_ms(metric.bytes_accessed, hardware)
         latency_ms = dominant_latency_ms(interconnect_ms, memory_ms, hardware)
 
         breakdown = {metric.name: {"flops": metric.flops, "bytes": metric.bytes_accessed}}
-        features = {
-            "pattern": 1.0 if self.config.pattern == "all_reduce" else 0.0,
-            "payload_mb": float(self.config.payload_mb),
-            "batch": float(batch),
-            "seq": float(seq),
-        }
 
         return LayerExecution(
             layer_name="communication",
@@ -67,7 +81,7 @@ class Communication:
             memory_time_ms=memory_ms,
             dominant_latency_ms=latency_ms,
             estimated_execution_time_ms=latency_ms,
-            features=features,
+            features=self.features(batch, seq),
             breakdown=breakdown,
         )
 
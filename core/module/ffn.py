@@ -2,44 +2,132 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 
 from core.data import HardwareSpec, LayerExecution
 from core.ops import (
     FusionMetrics,
-    compute_time_ms,
-    dominant_latency_ms,
     ffn_activation,
-    memory_time_ms,
+    ffn_activation_swiglu,
+    ffn_activation_swiglu_fused,
+    layer_times_ms,
     tensor_bytes,
 )
 
 DEFAULT_DTYPE_BITS = 16
+# HF-style ``hidden_act`` values that imply a gated (SwiGLU) FFN.
+_SWIGLU_HIDDEN_ACTS = frozenset({"silu", "swiglu"})
 
 
-@dataclass
+@dataclass(frozen=True)
 class FFNConfig:
     d_model: int = 768
     d_ff: int = 3072
     dtype_bits: int = DEFAULT_DTYPE_BITS
+    weight_bits: int | None = None
+    activation: str = "swiglu"
+    gate_fused: bool = True
+    # >= 1: up-projection, activation and down-projection run as one kernel, so the
+    # (B, S, hidden) intermediates never reach HBM.
+    kernel_fusion_level: int = 0
 
     @classmethod
     def from_dict(cls, data: Dict) -> "FFNConfig":
         return cls(
             d_model=int(data.get("d_model", 768)),
             d_ff=int(data.get("d_ff", data.get("intermediate_size", 3072))),
-            dtype_bits=int(data.get("dtype_bits", DEFAULT_DTYPE_BITS)),
+            dtype_bits=int(data.get("activation_bits", data.get("dtype_bits", DEFAULT_DTYPE_BITS))),
+            weight_bits=data.get("weight_bits"),
+            activation=_activation_from_dict(data),
+            gate_fused=bool(data.get("gate_fused", True)),
+            kernel_fusion_level=min(max(int(data.get("kernel_fusion_level", 0)), 0), 2),
         )
 
+    @property
+    def resolved_weight_bits(self) -> int:
+        return int(self.weight_bits) if self.weight_bits is not None else self.dtype_bits
+
+
+def _activation_from_dict(data: Dict) -> str:
+    activation = data.get("activation")
+    if activation is not None:
+        return str(activation).lower()
+    hidden_act = data.get("hidden_act")
+    if hidden_act is None:
+        return "swiglu"
+    hidden_act = str(hidden_act).lower()
+    return "swiglu" if hidden_act in _SWIGLU_HIDDEN_ACTS else hidden_act
+
+
+@lru_cache(maxsize=None)
+def _ffn_metrics(
+    d_model: int,
+    d_ff: int,
+    dtype_bits: int,
+    weight_bits: int,
+    activation: str,
+    gate_fused: bool,
+    kernel_fusion_level: int,
+    batch: int,
+    seq: int,
+) -> FusionMetrics:
+    if activation != "swiglu":
+        metric = ffn_activation(batch, seq, d_model, d_ff, dtype_bits=dtype_bits, weight_bits=weight_bits)
+        hidden_bytes = tensor_bytes((batch, seq, d_ff), dtype_bits) * 2
+    elif gate_fused:
+        metric = ffn_activation_swiglu_fused(batch, seq, d_model, d_ff, dtype_bits=dtype_bits, weight_bits=weight_bits)
+        hidden_bytes = tensor_bytes((batch, seq, 2 * d_ff), dtype_bits) * 2
+    else:
+        metric = ffn_activation_swiglu(batch, seq, d_model, d_ff, dtype_bits=dtype_bits, weight_bits=weight_bits)
+        hidden_bytes = tensor_bytes((batch, seq, d_ff), dtype_bits) * 6
+    if kernel_fusion_level > 0:
+        return metric.without_bytes(hidden_bytes)
+    return metric
+
 
 class FFN:
     def __init__(self, ffn_config: Dict, hardware_config: Dict | None = None):
-        self.config = FFNConfig.from_dict(ffn_config or {})
-        self.hardware_cfg = hardware_config or {}
+        self._setup(FFNConfig.from_dict(ffn_config or {}))
+
+    def _setup(self, config: FFNConfig) -> None:
+        self.config = config
+        self._metrics_cache: Dict[Tuple[int, int], FusionMetrics] = {}
+
+    @classmethod
+    def from_config(cls, config: FFNConfig) -> "FFN":
+        """Build from an already-parsed config, skipping ``from_dict``."""
+        module = cls.__new__(cls)
+        module._setup(config)
+        return module
 
     def _metrics(self, batch: int, seq: int) -> FusionMetrics:
+        cached = self._metrics_cache.get((batch, seq))
+        if cached is not None:
+            return cached
         cfg = self.config
-        return ffn_activation(batch, seq, cfg.d_model, cfg.d_ff, dtype_bits=cfg.dtype_bits)
+        metrics = _ffn_metrics(
+            cfg.d_model,
+            cfg.d_ff,
+            cfg.dtype_bits,
+            cfg.resolved_weight_bits,
+            cfg.activation,
+            cfg.gate_fused,
+            cfg.kernel_fusion_level,
+            batch,
+            seq,
+        )
+        self._metrics_cache[(batch, seq)] = metrics
+        return metrics
+
+    def features(self, batch: int, seq: int) -> Dict[str, float]:
+        return {
+            "d_model": float(self.config.d_model),
+            "d_ff": float(self.config.d_ff),
+            "batch": float(batch),
+            "seq": float(seq),
+            "dtype_bits": float(self.config.dtype_bits),
+        }
 
     def analytic_flops(self, batch: int, seq: int) -> float:
         return self._metrics(batch, seq).flops
@@ -50,17 +138,7 @@ class FFN:
         bytes_accessed = metric.bytes_accessed
         output_bytes = tensor_bytes((batch, seq, self.config.d_model), self.config.dtype_bits)
 
-        compute_ms = compute_time_ms(total_flops, hardware)
-        memory_ms = memory_time_ms(bytes_accessed + output_bytes, hardware)
-        latency_ms = dominant_latency_ms(compute_ms, memory_ms, hardware)
-
-        features = {
-            "d_model": float(self.config.d_model),
-            "d_ff": float(self.config.d_ff),
-            "batch": float(batch),
-            "seq": float(seq),
-            "dtype_bits": float(self.config.dtype_bits),
-        }
+        compute_ms, memory_ms, latency_ms = layer_times_ms(total_flops, bytes_accessed + output_bytes, hardware)
 
         breakdown = {metric.name: {"flops": metric.flops, "bytes": metric.bytes_accessed}}
 
@@ -74,7 +152,7 @@ class FFN:
             memory_time_ms=memory_ms,
             dominant_latency_ms=latency_ms,
             estimated_execution_time_ms=latency_ms,
-            features=features,
+            features=self.features(batch, seq),
             breakdown=breakdown,
         )
 
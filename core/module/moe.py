@@ -2,15 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Tuple
 
-from core.data import HardwareSpec, LayerExecution
+from core.data import HardwareSpec, LayerExecution, RuntimeSpec
 from core.ops import (
-    FusionMetrics,
+    FusionMetricsBatch,
     communication_all_to_all,
-    compute_time_ms,
-    dominant_latency_ms,
-    memory_time_ms,
+    layer_times_ms,
     moe_expert_forward,
     moe_routing,
     tensor_bytes,
@@ -19,7 +18,7 @@ from core.ops import (
 DEFAULT_DTYPE_BITS = 16
 
 
-@dataclass
+@dataclass(frozen=True)
 class MoEConfig:
     d_model: int = 768
     expert_hidden: int = 3072
@@ -28,6 +27,7 @@ class MoEConfig:
     avg_experts_per_token: float = 1.0
     num_groups: int = 1
     dtype_bits: int = DEFAULT_DTYPE_BITS
+    weight_bits: int | None = None
 
     @classmethod
     def from_dict(cls, data: Dict) -> "MoEConfig":
@@ -37,7 +37,7 @@ class MoEConfig:
         top_k = int(data.get("topk_group", data.get("top_k", data.get("num_experts_per_tok", 1))))
         avg_experts = float(data.get("num_experts_per_tok", top_k))
         num_groups = int(data.get("n_group", data.get("num_groups", 1)))
-        dtype_bits = int(data.get("dtype_bits", DEFAULT_DTYPE_BITS))
+        dtype_bits = int(data.get("activation_bits", data.get("dtype_bits", DEFAULT_DTYPE_BITS)))
         return cls(
             d_model=d_model,
             expert_hidden=hidden,
@@ -46,39 +46,82 @@ class MoEConfig:
             avg_experts_per_token=max(avg_experts, 1.0),
             num_groups=max(num_groups, 1),
             dtype_bits=dtype_bits,
+            weight_bits=data.get("weight_bits"),
         )
 
+    @property
+    def resolved_weight_bits(self) -> int:
+        return int(self.weight_bits) if self.weight_bits is not None else self.dtype_bits
 
-class MoE:
-    def __init__(self, moe_config: Dict, hardware_config: Dict | None = None):
-        self.config = MoEConfig.from_dict(moe_config or {})
-        self.hardware_cfg = hardware_config or {}
 
-    def _metrics(self, batch: int, seq: int) -> Tuple[FusionMetrics, ...]:
-        cfg = self.config
-        tokens = batch * seq
-        routing = moe_routing(batch, seq, cfg.num_experts, cfg.top_k, dtype_bits=cfg.dtype_bits)
-        active_tokens = int(tokens * cfg.avg_experts_per_token)
-        expert = moe_expert_forward(active_tokens, cfg.d_model, cfg.expert_hidden, dtype_bits=cfg.dtype_bits)
-        bytes_per_device = tensor_bytes((active_tokens, cfg.d_model), cfg.dtype_bits) / cfg.num_groups
-        comm = communication_all_to_all(bytes_per_device)
-        return routing, expert, comm
+@lru_cache(maxsize=None)
+def _moe_metrics(
+    d_model: int,
+    expert_hidden: int,
+    num_experts: int,
+    top_k: int,
+    avg_experts_per_token: float,
+    num_groups: int,
+    dtype_bits: int,
+    weight_bits: int,
+    tokens_per_expert: float | None,
+    batch: int,
+    seq: int,
+) -> FusionMetricsBatch:
+    tokens = batch * seq
+    routing = moe_routing(batch, seq, num_experts, top_k, dtype_bits=dtype_bits)
+    if tokens_per_expert is not None:
+        # Measured expert load from the runtime replaces the avg-experts-per-token estimate.
+        active_tokens = int(tokens_per_expert * num_experts)
+    else:
+        active_tokens = int(tokens * avg_experts_per_token)
+    expert = moe_expert_forward(active_tokens, d_model, expert_hidden, dtype_bits=dtype_bits, weight_bits=weight_bits)
+    bytes_per_device = tensor_bytes((active_tokens, d_model), dtype_bits) / num_groups
+    comm = communication_all_to_all(bytes_per_device)
+    return FusionMetricsBatch.from_metrics((routing, expert, comm))
 
-    def analytic_flops(self, batch: int, seq: int) -> float:
-        return sum(metric.flops for metric in self._metrics(batch, seq))
 
-    def estimate_execution_time(self, batch: int, seq: int, hardware: HardwareSpec) -> LayerExecution:
-        metrics = self._metrics(batch, seq)
-        total_flops = sum(m.flops for m in metrics)
-        bytes_accessed = sum(m.bytes_accessed for m in metrics)
-        output_bytes = tensor_bytes((batch, seq, self.config.d_model), self.config.dtype_bits)
+class MoE:
+    def __init__(
+        self, moe_config: Dict, hardware_config: Dict | None = None, *, runtime: RuntimeSpec | None = None
+    ):
+        self._setup(MoEConfig.from_dict(moe_config or {}), runtime)
+
+    def _setup(self, config: MoEConfig, runtime: RuntimeSpec | None) -> None:
+        self.config = config
+        self.tokens_per_expert = runtime.tokens_per_expert if runtime is not None else None
+        self._metrics_cache: Dict[Tuple[int, int], FusionMetricsBatch] = {}
+
+    @classmethod
+    def from_config(cls, config: MoEConfig, *, runtime: RuntimeSpec | None = None) -> "MoE":
+        """Build from an already-parsed config, skipping ``from_dict``."""
+        module = cls.__new__(cls)
+        module._setup(config, runtime)
+        return module
 
-        compute_ms = compute_time_ms(total_flops, hardware)
-        memory_ms = memory_time_ms(bytes_accessed + output_bytes, hardware)
-        latency_ms = dominant_latency_ms(compute_ms, memory_ms, hardware)
+    def _metrics(self, batch: int, seq: int) -> FusionMetricsBatch:
+        cached = self._metrics_cache.get((batch, seq))
+        if cached is not None:
+            return cached
+        cfg = self.config
+        metrics = _moe_metrics(
+            cfg.d_model,
+            cfg.expert_hidden,
+            cfg.num_experts,
+            cfg.top_k,
+            cfg.avg_experts_per_token,
+            cfg.num_groups,
+            cfg.dtype_bits,
+            cfg.resolved_weight_bits,
+            self.tokens_per_expert,
+            batch,
+            seq,
+        )
+        self._metrics_cache[(batch, seq)] = metrics
+        return metrics
 
-        breakdown = {m.name: {"flops": m.flops, "bytes": m.bytes_accessed} for m in metrics}
-        features = {
+    def features(self, batch: int, seq: int) -> Dict[str, float]:
+        return {
             "d_model": float(self.config.d_model),
             "expert_hidden": float(self.config.expert_hidden),
             "num_experts": float(self.config.num_experts),
@@ -88,6 +131,19 @@ class MoE:
             "seq": float(seq),
         }
 
+    def analytic_flops(self, batch: int, seq: int) -> float:
+        return self._metrics(batch, seq).total_flops
+
+    def estimate_execution_time(self, batch: int, seq: int, hardware: HardwareSpec) -> LayerExecution:
+        metrics = self._metrics(batch, seq)
+        total_flops = metrics.total_flops
+        bytes_accessed = metrics.total_bytes
+        output_bytes = tensor_bytes((batch, seq, self.config.d_model), self.config.dtype_bits)
+
+        compute_ms, memory_ms, latency_ms = layer_times_ms(total_flops, bytes_accessed + output_bytes, hardware)
+
+        breakdown = metrics.breakdown()
+
         return LayerExecution(
             layer_name="moe",
             layer_type="moe",
@@ -98,7 +154,7 @@ class MoE:
             memory_time_ms=memory_ms,
             dominant_latency_ms=latency_ms,
             estimated_execution_time_ms=latency_ms,
-            features=features,
+            features=self.features(batch, seq),
             breakdown=breakdown,
         )
 
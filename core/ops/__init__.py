@@ -3,12 +3,17 @@ from .metrics import (
     compute_time_ms,
     dominant_latency_ms,
     interconnect_time_ms,
+    layer_latencies_ms,
+    layer_times_ms,
     matmul_flops,
     memory_time_ms,
     tensor_bytes,
+    tensor_bytes_many,
 )
 from .fused_ops import (
     FusionMetrics,
+    FusionMetricsBatch,
+    attention_flash,
     attention_output_projection,
     attention_qkv_projections,
     attention_scores,
@@ -16,6 +21,8 @@ from .fused_ops import (
     communication_all_reduce,
     communication_all_to_all,
     ffn_activation,
+    ffn_activation_swiglu,
+    ffn_activation_swiglu_fused,
     moe_expert_forward,
     moe_routing,
 )
@@ -24,10 +31,15 @@ __all__ = [
     "compute_time_ms",
     "dominant_latency_ms",
     "interconnect_time_ms",
+    "layer_latencies_ms",
+    "layer_times_ms",
     "matmul_flops",
     "memory_time_ms",
     "tensor_bytes",
+    "tensor_bytes_many",
     "FusionMetrics",
+    "FusionMetricsBatch",
+    "attention_flash",
     "attention_output_projection",
     "attention_qkv_projections",
     "attention_scores",
@@ -35,6 +47,8 @@ __all__ = [
     "communication_all_reduce",
     "communication_all_to_all",
     "ffn_activation",
+    "ffn_activation_swiglu",
+    "ffn_activation_swiglu_fused",
     "moe_expert_forward",
     "moe_routing",
 ]
@@ -1,8 +1,10 @@
 """Catalog of fused operations used by analytic estimators."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Sequence, Tuple
+
+import numpy as np
 
 from .metrics import matmul_flops, tensor_bytes
 
@@ -18,72 +20,261 @@ class FusionMetrics:
     def as_dict(self) -> Dict[str, float]:
         return {"flops": self.flops, "bytes_accessed": self.bytes_accessed}
 
+    def without_bytes(self, saved_bytes: float) -> "FusionMetrics":
+        """Same op with ``saved_bytes`` of HBM traffic elided (kept on-chip by kernel fusion)."""
+        return FusionMetrics(self.name, self.flops, self.bytes_accessed - saved_bytes)
+
+
+@dataclass(frozen=True, eq=False)
+class FusionMetricsBatch:
+    """Struct-of-arrays view of the fused ops that make up one layer."""
+
+    names: Tuple[str, ...]
+    flops: np.ndarray
+    bytes_accessed: np.ndarray
+    # ndarray.sum() costs more than the handful of adds it saves at this size, so totals are
+    # summed once here (same left-to-right order as the vectorized reductions).
+    total_flops: float = field(init=False)
+    total_bytes: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Batches are memoized and shared between callers.
+        self.flops.setflags(write=False)
+        self.bytes_accessed.setflags(write=False)
+        object.__setattr__(self, "total_flops", sum(self.flops.tolist()))
+        object.__setattr__(self, "total_bytes", sum(self.bytes_accessed.tolist()))
+
+    @classmethod
+    def from_metrics(cls, metrics: Sequence[FusionMetrics]) -> "FusionMetricsBatch":
+        flops = np.array([m.flops for m in metrics], dtype=np.float64)
+        bytes_accessed = np.array([m.bytes_accessed for m in metrics], dtype=np.float64)
+        return cls(tuple(m.name for m in metrics), flops, bytes_accessed)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> FusionMetrics:
+        return FusionMetrics(self.names[index], float(self.flops[index]), float(self.bytes_accessed[index]))
 
-def attention_qkv_projections(batch: int, seq: int, d_model: int, qkv_dim: int, *, dtype_bits: int = DEFAULT_DTYPE_BITS) -> FusionMetrics:
+    def __iter__(self) -> Iterator[FusionMetrics]:
+        for name, flops, bytes_accessed in zip(self.names, self.flops.tolist(), self.bytes_accessed.tolist()):
+            yield FusionMetrics(name, flops, bytes_accessed)
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"flops": flops, "bytes": bytes_accessed}
+            for name, flops, bytes_accessed in zip(self.names, self.flops.tolist(), self.bytes_accessed.tolist())
+        }
+
+
+def _dequant_flops(weight_elements: int, weight_bits: int, dtype_bits: int) -> float:
+    # Weights stored narrower than the compute dtype are upcast (scale multiply + convert)
+    # before the GEMM: ~2 FLOPs per weight element.
+    return 2.0 * weight_elements if weight_bits < dtype_bits else 0.0
+
+
+def attention_qkv_projections(
+    batch: int,
+    seq: int,
+    d_model: int,
+    qkv_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    weight_bits: int | None = None,
+    kv_bits: int | None = None,
+    fused: bool = True,
+) -> FusionMetrics:
+    # dtype_bits is the activation width; weights and the K/V outputs default to it.
+    weight_bits = dtype_bits if weight_bits is None else weight_bits
+    kv_bits = dtype_bits if kv_bits is None else kv_bits
     tokens = batch * seq
     flops_per = matmul_flops(tokens, qkv_dim, d_model)
-    flops = 3.0 * flops_per
+    flops = 3.0 * flops_per + _dequant_flops(3 * d_model * qkv_dim, weight_bits, dtype_bits)
     input_bytes = tensor_bytes((batch, seq, d_model), dtype_bits)
-    weight_bytes = tensor_bytes((d_model, qkv_dim), dtype_bits) * 3
-    output_bytes = tensor_bytes((batch, seq, qkv_dim), dtype_bits) * 3
-    total_bytes = input_bytes + weight_bytes + output_bytes
+    if fused:
+        # W_q|W_k|W_v packed into one GEMM: x is streamed once, one packed output write.
+        weight_bytes = tensor_bytes((d_model, 3 * qkv_dim), weight_bits)
+        output_bytes = tensor_bytes((batch, seq, qkv_dim), dtype_bits) + tensor_bytes((batch, seq, 2 * qkv_dim), kv_bits)
+        total_bytes = input_bytes + weight_bytes + output_bytes
+        return FusionMetrics("attention_qkv_proj_fused", flops, total_bytes)
+    # Three independent GEMMs each re-read x.
+    weight_bytes = tensor_bytes((d_model, qkv_dim), weight_bits) * 3
+    output_bytes = tensor_bytes((batch, seq, qkv_dim), dtype_bits) + tensor_bytes((batch, seq, qkv_dim), kv_bits) * 2
+    total_bytes = input_bytes * 3 + weight_bytes + output_bytes
     return FusionMetrics("attention_qkv_proj", flops, total_bytes)
 
 
-def attention_scores(batch: int, seq: int, num_heads: int, head_dim: int, *, dtype_bits: int = DEFAULT_DTYPE_BITS) -> FusionMetrics:
+def attention_scores(
+    batch: int,
+    seq: int,
+    num_heads: int,
+    head_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    kv_bits: int | None = None,
+) -> FusionMetrics:
     # Q x K^T matmul plus softmax
+    kv_bits = dtype_bits if kv_bits is None else kv_bits
     flops_per_head = matmul_flops(seq, seq, head_dim)
     flops = flops_per_head * batch * num_heads
     softmax_flops = batch * num_heads * seq * seq
     total_flops = flops + softmax_flops
     q_bytes = tensor_bytes((batch, num_heads, seq, head_dim), dtype_bits)
-    k_bytes = tensor_bytes((batch, num_heads, seq, head_dim), dtype_bits)
+    k_bytes = tensor_bytes((batch, num_heads, seq, head_dim), kv_bits)
     attn_bytes = tensor_bytes((batch, num_heads, seq, seq), dtype_bits)
     total_bytes = q_bytes + k_bytes + attn_bytes
     return FusionMetrics("attention_scores", total_flops, total_bytes)
 
 
-def attention_weighted_sum(batch: int, seq: int, num_heads: int, head_dim: int, *, dtype_bits: int = DEFAULT_DTYPE_BITS) -> FusionMetrics:
+def attention_weighted_sum(
+    batch: int,
+    seq: int,
+    num_heads: int,
+    head_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    kv_bits: int | None = None,
+) -> FusionMetrics:
+    kv_bits = dtype_bits if kv_bits is None else kv_bits
     flops_per_head = matmul_flops(seq, head_dim, seq)
     flops = flops_per_head * batch * num_heads
     attn_bytes = tensor_bytes((batch, num_heads, seq, seq), dtype_bits)
-    v_bytes = tensor_bytes((batch, num_heads, seq, head_dim), dtype_bits)
+    v_bytes = tensor_bytes((batch, num_heads, seq, head_dim), kv_bits)
     output_bytes = tensor_bytes((batch, seq, num_heads * head_dim), dtype_bits)
     total_bytes = attn_bytes + v_bytes + output_bytes
     return FusionMetrics("attention_weighted_sum", flops, total_bytes)
 
 
-def attention_output_projection(batch: int, seq: int, d_model: int, qkv_dim: int, *, dtype_bits: int = DEFAULT_DTYPE_BITS) -> FusionMetrics:
+def attention_flash(
+    batch: int,
+    seq: int,
+    num_heads: int,
+    head_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    kv_bits: int | None = None,
+) -> FusionMetrics:
+    kv_bits = dtype_bits if kv_bits is None else kv_bits
+    # QK^T, softmax and PV in one tiled kernel; the (S, S) score matrix never reaches HBM.
+    qk_flops = matmul_flops(seq, seq, head_dim) * batch * num_heads
+    softmax_flops = batch * num_heads * seq * seq
+    av_flops = matmul_flops(seq, head_dim, seq) * batch * num_heads
+    total_flops = qk_flops + softmax_flops + av_flops
+    q_bytes = tensor_bytes((batch, num_heads, seq, head_dim), dtype_bits)
+    k_bytes = tensor_bytes((batch, num_heads, seq, head_dim), kv_bits)
+    v_bytes = tensor_bytes((batch, num_heads, seq, head_dim), kv_bits)
+    output_bytes = tensor_bytes((batch, seq, num_heads * head_dim), dtype_bits)
+    total_bytes = q_bytes + k_bytes + v_bytes + output_bytes
+    return FusionMetrics("attention_flash", total_flops, total_bytes)
+
+
+def attention_output_projection(
+    batch: int,
+    seq: int,
+    d_model: int,
+    qkv_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    weight_bits: int | None = None,
+) -> FusionMetrics:
+    weight_bits = dtype_bits if weight_bits is None else weight_bits
     tokens = batch * seq
-    flops = matmul_flops(tokens, d_model, qkv_dim)
+    flops = matmul_flops(tokens, d_model, qkv_dim) + _dequant_flops(qkv_dim * d_model, weight_bits, dtype_bits)
     input_bytes = tensor_bytes((batch, seq, qkv_dim), dtype_bits)
-    weight_bytes = tensor_bytes((qkv_dim, d_model), dtype_bits)
+    weight_bytes = tensor_bytes((qkv_dim, d_model), weight_bits)
     output_bytes = tensor_bytes((batch, seq, d_model), dtype_bits)
     total_bytes = input_bytes + weight_bytes + output_bytes
     return FusionMetrics("attention_output_proj", flops, total_bytes)
 
 
-def ffn_activation(batch: int, seq: int, d_model: int, hidden_dim: int, *, dtype_bits: int = DEFAULT_DTYPE_BITS) -> FusionMetrics:
+def ffn_activation(
+    batch: int,
+    seq: int,
+    d_model: int,
+    hidden_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    weight_bits: int | None = None,
+) -> FusionMetrics:
+    weight_bits = dtype_bits if weight_bits is None else weight_bits
     tokens = batch * seq
     flops_first = matmul_flops(tokens, hidden_dim, d_model)
     flops_second = matmul_flops(tokens, d_model, hidden_dim)
     activation_flops = tokens * hidden_dim  # simple approximation for SwiGLU/SiLU
-    total_flops = flops_first + flops_second + activation_flops
+    dequant_flops = _dequant_flops(2 * d_model * hidden_dim, weight_bits, dtype_bits)
+    total_flops = flops_first + flops_second + activation_flops + dequant_flops
     input_bytes = tensor_bytes((batch, seq, d_model), dtype_bits)
     hidden_bytes = tensor_bytes((batch, seq, hidden_dim), dtype_bits) * 2
-    weight_bytes = tensor_bytes((d_model, hidden_dim), dtype_bits) + tensor_bytes((hidden_dim, d_model), dtype_bits)
+    weight_bytes = tensor_bytes((d_model, hidden_dim), weight_bits) + tensor_bytes((hidden_dim, d_model), weight_bits)
     total_bytes = input_bytes + hidden_bytes + weight_bytes
     return FusionMetrics("ffn", total_flops, total_bytes)
 
 
-def moe_expert_forward(active_tokens: int, d_model: int, expert_hidden: int, *, dtype_bits: int = DEFAULT_DTYPE_BITS) -> FusionMetrics:
+def ffn_activation_swiglu(
+    batch: int,
+    seq: int,
+    d_model: int,
+    hidden_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    weight_bits: int | None = None,
+) -> FusionMetrics:
+    weight_bits = dtype_bits if weight_bits is None else weight_bits
+    tokens = batch * seq
+    flops_first = 2 * matmul_flops(tokens, hidden_dim, d_model)  # W_gate and W_up
+    flops_second = matmul_flops(tokens, d_model, hidden_dim)
+    activation_flops = tokens * hidden_dim
+    dequant_flops = _dequant_flops(3 * d_model * hidden_dim, weight_bits, dtype_bits)
+    total_flops = flops_first + flops_second + activation_flops + dequant_flops
+    # Separate gate/up GEMMs each stream x; both outputs and the activated product round-trip HBM.
+    input_bytes = tensor_bytes((batch, seq, d_model), dtype_bits) * 2
+    hidden_bytes = tensor_bytes((batch, seq, hidden_dim), dtype_bits) * 6
+    weight_bytes = tensor_bytes((d_model, hidden_dim), weight_bits) * 2 + tensor_bytes((hidden_dim, d_model), weight_bits)
+    total_bytes = input_bytes + hidden_bytes + weight_bytes
+    return FusionMetrics("ffn_swiglu", total_flops, total_bytes)
+
+
+def ffn_activation_swiglu_fused(
+    batch: int,
+    seq: int,
+    d_model: int,
+    hidden_dim: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    weight_bits: int | None = None,
+) -> FusionMetrics:
+    weight_bits = dtype_bits if weight_bits is None else weight_bits
+    tokens = batch * seq
+    flops_first = 2 * matmul_flops(tokens, hidden_dim, d_model)
+    flops_second = matmul_flops(tokens, d_model, hidden_dim)
+    activation_flops = tokens * hidden_dim
+    dequant_flops = _dequant_flops(3 * d_model * hidden_dim, weight_bits, dtype_bits)
+    total_flops = flops_first + flops_second + activation_flops + dequant_flops
+    # W_gate|W_up packed into one GEMM; SiLU(gate) * up is applied as the down-proj prologue.
+    input_bytes = tensor_bytes((batch, seq, d_model), dtype_bits)
+    gate_up_bytes = tensor_bytes((batch, seq, 2 * hidden_dim), dtype_bits) * 2
+    weight_bytes = tensor_bytes((d_model, 2 * hidden_dim), weight_bits) + tensor_bytes((hidden_dim, d_model), weight_bits)
+    total_bytes = input_bytes + gate_up_bytes + weight_bytes
+    return FusionMetrics("ffn_swiglu_fused", total_flops, total_bytes)
+
+
+def moe_expert_forward(
+    active_tokens: int,
+    d_model: int,
+    expert_hidden: int,
+    *,
+    dtype_bits: int = DEFAULT_DTYPE_BITS,
+    weight_bits: int | None = None,
+) -> FusionMetrics:
+    weight_bits = dtype_bits if weight_bits is None else weight_bits
     flops_first = matmul_flops(active_tokens, expert_hidden, d_model)
     flops_second = matmul_flops(active_tokens, d_model, expert_hidden)
     activation_flops = active_tokens * expert_hidden
-    total_flops = flops_first + flops_second + activation_flops
+    dequant_flops = _dequant_flops(2 * d_model * expert_hidden, weight_bits, dtype_bits)
+    total_flops = flops_first + flops_second + activation_flops + dequant_flops
     act_bytes = tensor_bytes((active_tokens, d_model), dtype_bits)
     hidden_bytes = tensor_bytes((active_tokens, expert_hidden), dtype_bits)
-    weight_bytes = tensor_bytes((d_model, expert_hidden), dtype_bits) + tensor_bytes((expert_hidden, d_model), dtype_bits)
+    weight_bytes = tensor_bytes((d_model, expert_hidden), weight_bits) + tensor_bytes((expert_hidden, d_model), weight_bits)
     total_bytes = act_bytes + hidden_bytes + weight_bytes
     return FusionMetrics("moe_expert", total_flops, total_bytes)
 
@@ -1,11 +1,14 @@
 """Reusable metric helpers for FLOPs, tensor sizing, and timing."""
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
 
 from core.data import HardwareSpec
+from core.data.specs import BYTES_PER_GB
 
-BYTES_PER_GB = 1e9
+_INF = float("inf")
 
 
 def matmul_flops(m: int, n: int, k: int) -> float:
@@ -28,31 +31,65 @@ def sum_tensor_bytes(shapes: Iterable[Sequence[int]], dtype_bits: int = 16) -> f
     return sum(tensor_bytes(shape, dtype_bits=dtype_bits) for shape in shapes)
 
 
+def tensor_bytes_many(shapes: np.ndarray, dtype_bits: float | np.ndarray = 16) -> np.ndarray:
+    """Vectorized ``tensor_bytes`` over the last axis of a (..., rank) shape array.
+
+    Pad shorter shapes with 1. ``dtype_bits`` may be a scalar or broadcast against the
+    leading axes (e.g. one width per layer).
+    """
+    elements = np.prod(np.maximum(np.asarray(shapes, dtype=np.int64), 0), axis=-1)
+    return elements * (np.asarray(dtype_bits, dtype=np.float64) * 0.125)
+
+
 def compute_time_ms(flops: float, hardware: HardwareSpec) -> float:
-    throughput = hardware.compute_throughput_tflops()
-    if throughput <= 0:
-        return float("inf")
-    seconds = flops / (throughput * 1e12)
-    return seconds * 1e3
+    ms_per_flop = hardware._ms_per_flop
+    if ms_per_flop == _INF:
+        return _INF
+    return flops * ms_per_flop
 
 
 def memory_time_ms(bytes_moved: float, hardware: HardwareSpec) -> float:
-    bandwidth = hardware.memory_bandwidth_bytes()
-    if bandwidth <= 0:
-        return float("inf")
-    seconds = bytes_moved / bandwidth
-    return seconds * 1e3
+    ms_per_byte = hardware._ms_per_mem_byte
+    if ms_per_byte == _INF:
+        return _INF
+    return bytes_moved * ms_per_byte
 
 
 def interconnect_time_ms(bytes_moved: float, hardware: HardwareSpec) -> float:
-    bandwidth = hardware.interconnect_bandwidth_bytes()
-    if bandwidth <= 0:
-        return 0.0
-    seconds = bytes_moved / bandwidth
-    return seconds * 1e3
+    # Missing interconnect is reported as zero time (ms per byte cached as 0.0).
+    return bytes_moved * hardware._ms_per_ic_byte
 
 
 def dominant_latency_ms(compute_ms: float, memory_ms: float, hardware: HardwareSpec) -> float:
-    overlap = hardware.effective_overlap()
-    adjusted_memory = memory_ms / overlap
+    adjusted_memory = memory_ms / hardware._overlap_eff
     return max(compute_ms, adjusted_memory)
+
+
+def layer_times_ms(flops: float, bytes_moved: float, hardware: HardwareSpec) -> Tuple[float, float, float]:
+    """Return (compute_ms, memory_ms, dominant_ms) for one layer."""
+    compute_ms = compute_time_ms(flops, hardware)
+    memory_ms = memory_time_ms(bytes_moved, hardware)
+    return compute_ms, memory_ms, max(compute_ms, memory_ms / hardware._overlap_eff)
+
+
+def layer_latencies_ms(
+    flops: np.ndarray, memory_bytes: np.ndarray, interconnect_bound: np.ndarray, hardware: HardwareSpec
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized ``layer_times_ms`` over many layers.
+
+    Layers flagged ``interconnect_bound`` report ``interconnect_time_ms(memory_bytes)`` as their
+    compute time, matching the communication module.
+    """
+    if hardware._ms_per_flop == _INF:
+        compute_ms = np.full_like(flops, _INF)
+    else:
+        compute_ms = flops * hardware._ms_per_flop
+    if interconnect_bound.any():
+        interconnect_ms = memory_bytes * hardware._ms_per_ic_byte
+        compute_ms = np.where(interconnect_bound, interconnect_ms, compute_ms)
+    if hardware._ms_per_mem_byte == _INF:
+        memory_ms = np.full_like(memory_bytes, _INF)
+    else:
+        memory_ms = memory_bytes * hardware._ms_per_mem_byte
+    latency_ms = np.maximum(compute_ms, memory_ms / hardware._overlap_eff)
+    return compute_ms, memory_ms, latency_ms
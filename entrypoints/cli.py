@@ -2,16 +2,19 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, List, Sequence
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple
 
-from core.data import LayerExecution, RuntimeSpec
-from core.estimation import AnalyticEstimator
-
-from .simulator import Scenario, load_scenario, run_simulation
 from .utils import format_gb, format_gflops, format_ms
 
+if TYPE_CHECKING:
+    from core.data import LayerExecution
+
+    from .simulator import Scenario
+
 
 # ---------------------------------------------------------------------------
 # Rendering helpers
@@ -21,43 +24,42 @@ from .utils import format_gb, format_gflops, format_ms
 _DEF_PAD = 12
 
 
-def _print_afd_table(layers: Sequence[LayerExecution]) -> None:
-    headers = ["layer", "type", "gflops", "compute_ms", "memory_ms", "latency_ms"]
-    row_fmt = "{layer:>12} {layer_type:>10} {gflops:>10} {compute_ms:>12} {memory_ms:>12} {latency_ms:>12}"
-    print(" ".join(h.rjust(_DEF_PAD) for h in headers))
-    for layer in layers:
-        print(
-            row_fmt.format(
-                layer=layer.layer_name,
-                layer_type=layer.layer_type,
-                gflops=format_gflops(layer.flops),
-                compute_ms=format_ms(layer.compute_time_ms),
-                memory_ms=format_ms(layer.memory_time_ms),
-                latency_ms=format_ms(layer.dominant_latency_ms),
-            )
-        )
+# Row formatters are plain f-string functions: the format specs are compiled once with the
+# function instead of being re-parsed by str.format for every layer.
+def _afd_row(layer: LayerExecution) -> str:
+    return (
+        f"{layer.layer_name:>12} {layer.layer_type:>10} {format_gflops(layer.flops):>10} "
+        f"{format_ms(layer.compute_time_ms):>12} {format_ms(layer.memory_time_ms):>12} "
+        f"{format_ms(layer.dominant_latency_ms):>12}"
+    )
 
 
-def _print_large_ep_table(layers: Sequence[LayerExecution]) -> None:
-    headers = ["layer", "type", "gflops", "bytes_gb", "latency_ms"]
-    row_fmt = "{layer:>12} {layer_type:>12} {gflops:>10} {bytes_gb:>10} {latency_ms:>12}"
-    print(" ".join(h.rjust(_DEF_PAD) for h in headers))
-    for layer in layers:
-        bytes_total = layer.bytes_read + layer.bytes_written
-        print(
-            row_fmt.format(
-                layer=layer.layer_name,
-                layer_type=layer.layer_type,
-                gflops=format_gflops(layer.flops),
-                bytes_gb=format_gb(bytes_total),
-                latency_ms=format_ms(layer.dominant_latency_ms),
-            )
-        )
+def _large_ep_row(layer: LayerExecution) -> str:
+    return (
+        f"{layer.layer_name:>12} {layer.layer_type:>12} {format_gflops(layer.flops):>10} "
+        f"{format_gb(layer.bytes_total):>10} {format_ms(layer.dominant_latency_ms):>12}"
+    )
+
 
+def _table_lines(
+    headers: Sequence[str], row: Callable[[LayerExecution], str], layers: Sequence[LayerExecution]
+) -> List[str]:
+    lines = [" ".join(h.rjust(_DEF_PAD) for h in headers)]
+    lines.extend(map(row, layers))
+    return lines
 
-_TABLE_RENDERERS: Dict[str, Callable[[Sequence[LayerExecution]], None]] = {
-    "afd": _print_afd_table,
-    "large_ep": _print_large_ep_table,
+
+def _render_afd_table(layers: Sequence[LayerExecution]) -> List[str]:
+    return _table_lines(["layer", "type", "gflops", "compute_ms", "memory_ms", "latency_ms"], _afd_row, layers)
+
+
+def _render_large_ep_table(layers: Sequence[LayerExecution]) -> List[str]:
+    return _table_lines(["layer", "type", "gflops", "bytes_gb", "latency_ms"], _large_ep_row, layers)
+
+
+_TABLE_RENDERERS: Dict[str, Callable[[Sequence[LayerExecution]], List[str]]] = {
+    "afd": _render_afd_table,
+    "large_ep": _render_large_ep_table,
 }
 
 
@@ -66,31 +68,34 @@ _TABLE_RENDERERS: Dict[str, Callable[[Sequence[LayerExecution]], None]] = {
 # ---------------------------------------------------------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WorkflowDefinition:
     name: str
     help_text: str
     command: str
     command_help: str
-    table_renderer: Callable[[Sequence[LayerExecution]], None]
+    table_renderer: Callable[[Sequence[LayerExecution]], List[str]]
 
 
-WORKFLOWS: Dict[str, WorkflowDefinition] = {
-    "afd": WorkflowDefinition(
+# Registration order is the order workflows appear in --help.
+_WORKFLOW_DEFINITIONS: Tuple[WorkflowDefinition, ...] = (
+    WorkflowDefinition(
         name="afd",
         help_text="Attention–FFN disaggregation workflows",
         command="simulate",
         command_help="Run analytic AFD simulation",
         table_renderer=_TABLE_RENDERERS["afd"],
     ),
-    "large-ep": WorkflowDefinition(
+    WorkflowDefinition(
         name="large-ep",
         help_text="Large expert-parallel workflows",
         command="evaluate",
         command_help="Run expert-parallel analytic simulation",
         table_renderer=_TABLE_RENDERERS["large_ep"],
     ),
-}
+)
+
+WORKFLOWS: Dict[str, WorkflowDefinition] = {definition.name: definition for definition in _WORKFLOW_DEFINITIONS}
 
 
 # ---------------------------------------------------------------------------
@@ -102,33 +107,42 @@ def _attach_shared_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("scenario", type=str, help="Path to scenario YAML")
     parser.add_argument("--batch", type=int, required=True, help="Batch size")
     parser.add_argument("--seq", type=int, required=True, help="Sequence length")
-    parser.add_argument("--output", type=str, help="Optional path to dump raw result dict")
+    parser.add_argument("--output", type=str, help="Optional path to write the raw result as JSON")
 
 
 def _run_simulation(args: argparse.Namespace) -> Scenario:
+    # The estimator stack (numpy) and YAML loading are only imported once a command runs.
+    from core.data import RuntimeSpec
+    from core.estimation import AnalyticEstimator
+
+    from .simulator import load_scenario, run_simulation, write_result_json
+
     scenario: Scenario = load_scenario(args.scenario)
     runtime = RuntimeSpec(batch_size=args.batch, seq_len=args.seq)
     estimator = AnalyticEstimator(scenario.hardware, runtime)
     result = run_simulation(scenario, runtime, estimator=estimator)
 
-    print(f"Scenario: {scenario.name}")
-    print(f"Hardware: {scenario.hardware.name}")
-
     workflow_key = args.workflow
     definition = WORKFLOWS.get(workflow_key)
     if definition is None:
         raise ValueError(f"Unknown workflow '{workflow_key}'")
-    definition.table_renderer(result.layers)
 
-    print("\nTotals:")
-    print(f"  Total latency (ms): {result.total_latency_ms:.3f}")
-    print(f"  Total FLOPs (GFLOPs): {result.total_flops / 1e9:.3f}")
-    print(f"  Peak memory (GB): {result.peak_memory_bytes / 1e9:.3f}")
-    print(f"  Bottleneck layer: {result.bottleneck_layer}")
+    # Build the whole report and emit it with one write rather than a print() per line.
+    lines = [f"Scenario: {scenario.name}", f"Hardware: {scenario.hardware.name}"]
+    lines.extend(definition.table_renderer(result.layers))
+    lines += [
+        "",
+        "Totals:",
+        f"  Total latency (ms): {result.total_latency_ms:.3f}",
+        f"  Total FLOPs (GFLOPs): {result.total_flops / 1e9:.3f}",
+        f"  Peak memory (GB): {result.peak_memory_bytes / 1e9:.3f}",
+        f"  Bottleneck layer: {result.bottleneck_layer}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
     if args.output:
         path = Path(args.output)
-        path.write_text(str(result.to_dict()))
+        write_result_json(result, path)
         print(f"\nSaved raw result to {path}")
 
     return scenario
@@ -139,22 +153,101 @@ def _run_simulation(args: argparse.Namespace) -> Scenario:
 # ---------------------------------------------------------------------------
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="AFDSimulator unified CLI")
-    workflow_subparsers = parser.add_subparsers(dest="workflow", required=True)
+class _LazyParserMap(dict):
+    """Name -> parser map whose parsers are built on first lookup.
+
+    Names are registered up front, so usage, ``--help`` and choice validation see every
+    choice without building anything; any value access returns the real parser.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._pending: Dict[str, Callable[[], argparse.ArgumentParser]] = {}
+
+    def add_lazy(self, name: str, build: Callable[[], argparse.ArgumentParser]) -> None:
+        super().__setitem__(name, None)
+        self._pending[name] = build
+
+    def __getitem__(self, name: str) -> argparse.ArgumentParser:
+        build = self._pending.pop(name, None)
+        if build is not None:
+            super().__setitem__(name, build())
+        return super().__getitem__(name)
+
+    def get(self, name: str, default=None):
+        return self[name] if name in self else default
 
-    for key, definition in WORKFLOWS.items():
-        workflow_parser = workflow_subparsers.add_parser(key, help=definition.help_text)
+    def values(self) -> List[argparse.ArgumentParser]:
+        return [self[name] for name in self]
+
+    def items(self) -> List[Tuple[str, argparse.ArgumentParser]]:
+        return [(name, self[name]) for name in self]
+
+
+class _LazySubParsersAction(argparse._SubParsersAction):
+    """Subparsers action that only builds the parser for the choice actually selected.
+
+    ``add_lazy_parser`` registers the name with a builder; the real parser is populated the
+    first time it is looked up, normally on dispatch.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._name_parser_map = self.choices = _LazyParserMap()
+
+    def add_lazy_parser(self, name: str, builder: Callable[[argparse.ArgumentParser], None], **kwargs) -> None:
+        if name in self._name_parser_map:
+            raise argparse.ArgumentError(self, f"conflicting subparser: {name}")
+        if "help" in kwargs:
+            self._choices_actions.append(self._ChoicesPseudoAction(name, (), kwargs.pop("help")))
+        kwargs.setdefault("prog", f"{self._prog_prefix} {name}")
+
+        def build() -> argparse.ArgumentParser:
+            subparser = self._parser_class(**kwargs)
+            builder(subparser)
+            return subparser
+
+        self._name_parser_map.add_lazy(name, build)
+
+
+def _build_command_parser(command_parser: argparse.ArgumentParser) -> None:
+    _attach_shared_arguments(command_parser)
+    command_parser.set_defaults(handler=_run_simulation)
+
+
+def _build_workflow_parser(key: str, definition: WorkflowDefinition) -> Callable[[argparse.ArgumentParser], None]:
+    def build(workflow_parser: argparse.ArgumentParser) -> None:
         workflow_parser.set_defaults(workflow=key)
-        command_subparsers = workflow_parser.add_subparsers(dest="command", required=True)
+        command_subparsers = workflow_parser.add_subparsers(
+            dest="command", required=True, action=_LazySubParsersAction
+        )
+        command_subparsers.add_lazy_parser(definition.command, _build_command_parser, help=definition.command_help)
+
+    return build
 
-        command_parser = command_subparsers.add_parser(definition.command, help=definition.command_help)
-        _attach_shared_arguments(command_parser)
-        command_parser.set_defaults(handler=_run_simulation)
+
+@functools.cache
+def build_parser() -> argparse.ArgumentParser:
+    """Return the CLI parser, built once per process and shared by every ``main()`` call.
+
+    Workflow sub-parsers materialized by one call stay registered for the next. Treat the
+    returned parser as read-only; use ``_reset_parser_cache`` to force a rebuild.
+    """
+    parser = argparse.ArgumentParser(description="AFDSimulator unified CLI")
+    workflow_subparsers = parser.add_subparsers(dest="workflow", required=True, action=_LazySubParsersAction)
+
+    for definition in _WORKFLOW_DEFINITIONS:
+        workflow_subparsers.add_lazy_parser(
+            definition.name, _build_workflow_parser(definition.name, definition), help=definition.help_text
+        )
 
     return parser
 
 
+def _reset_parser_cache() -> None:
+    build_parser.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -2,9 +2,11 @@
 """Scenario loading, simulation orchestration, and reporting helpers."""
 from __future__ import annotations
 
+import json
+from collections import ChainMap
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Union
+from typing import Dict, Iterable, List, Mapping, Sequence, Union
 
 from core.data import (
     BaseLayerConfig,
@@ -20,6 +22,7 @@ from .utils import (
     layer_config_from_dict,
     maybe_load_reference,
     read_yaml,
+    resolve_path,
 )
 
 
@@ -31,7 +34,7 @@ class Scenario:
 
 
 def load_scenario(path: Union[str, Path]) -> Scenario:
-    scenario_path = Path(path).resolve()
+    scenario_path = resolve_path(path)
     data = read_yaml(scenario_path)
     base_dir = scenario_path.parent
 
@@ -54,11 +57,14 @@ def load_scenario(path: Union[str, Path]) -> Scenario:
             config_dict = maybe_load_reference(base_dir, layer_entry["config"])
         else:
             config_dict = layer_entry
-        merged = dict(config_dict)
         overrides = layer_entry.get("overrides", {})
-        if overrides:
-            merged.update(overrides)
-        merged.setdefault("name", layer_entry.get("name"))
+        entry_name = layer_entry.get("name")
+        if not overrides and (entry_name is None or "name" in config_dict):
+            # Nothing to merge: read_yaml already hands back a private copy.
+            merged: Mapping = config_dict
+        else:
+            # Overrides win, then the referenced config, then the entry's own name.
+            merged = ChainMap(overrides or {}, config_dict, {"name": entry_name})
         layer_config = layer_config_from_dict(idx, layer_type, merged)
         layer_configs.append(layer_config)
 
@@ -71,16 +77,34 @@ def run_simulation(
     runtime: RuntimeSpec,
     *,
     estimator: AnalyticEstimator | None = None,
+    keep_layers: bool = True,
 ) -> SimulationResult:
-    active_estimator = estimator or AnalyticEstimator(scenario.hardware, runtime)
-    executions: List[LayerExecution] = active_estimator.estimate_layers(scenario.layers)
+    """Estimate every layer of ``scenario`` and aggregate the totals.
 
-    total_flops = sum(exec.flops for exec in executions)
-    total_latency = sum(exec.dominant_latency_ms for exec in executions)
-    peak_memory = max((exec.bytes_read + exec.bytes_written) for exec in executions)
-    bottleneck_layer = (
-        max(executions, key=lambda e: e.dominant_latency_ms).layer_name if executions else None
-    )
+    With ``keep_layers=False`` only the aggregates are kept and ``result.layers`` is empty,
+    so no per-layer execution outlives its contribution to the totals.
+    """
+    active_estimator = estimator or AnalyticEstimator(scenario.hardware, runtime)
+    executions: List[LayerExecution] = []
+
+    # One pass over the layers; strict ">" keeps the first layer on latency ties, like max().
+    total_flops = 0.0
+    total_latency = 0.0
+    peak_memory = 0.0
+    bottleneck_latency = float("-inf")
+    bottleneck_layer = None
+    for execution in active_estimator.iter_layers(scenario.layers):
+        if keep_layers:
+            executions.append(execution)
+        total_flops += execution.flops
+        latency = execution.dominant_latency_ms
+        total_latency += latency
+        memory = execution.bytes_total
+        if memory > peak_memory:
+            peak_memory = memory
+        if latency > bottleneck_latency:
+            bottleneck_latency = latency
+            bottleneck_layer = execution.layer_name
 
     return SimulationResult(
         layers=executions,
@@ -91,21 +115,34 @@ def run_simulation(
     )
 
 
+def write_result_json(result: SimulationResult, path: Path) -> None:
+    """Stream ``result.to_dict()`` to ``path`` as JSON, one layer dict in memory at a time."""
+    separators = (",", ":")
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write('{"layers":[')
+        for idx, layer_dict in enumerate(result.iter_layer_dicts()):
+            if idx:
+                handle.write(",")
+            json.dump(layer_dict, handle, separators=separators)
+        handle.write("]")
+        for key, value in result.totals().items():
+            handle.write(f",{json.dumps(key)}:{json.dumps(value)}")
+        handle.write("}")
+
+
 def layer_table(result: SimulationResult) -> List[dict]:
-    table: List[dict] = []
-    for layer in result.layers:
-        table.append(
-            {
-                "layer": layer.layer_name,
-                "type": layer.layer_type,
-                "gflops": layer.flops / 1e9,
-                "compute_ms": layer.compute_time_ms,
-                "memory_ms": layer.memory_time_ms,
-                "latency_ms": layer.dominant_latency_ms,
-                "bytes_gb": (layer.bytes_read + layer.bytes_written) / 1e9,
-            }
-        )
-    return table
+    return [
+        {
+            "layer": layer.layer_name,
+            "type": layer.layer_type,
+            "gflops": layer.flops / 1e9,
+            "compute_ms": layer.compute_time_ms,
+            "memory_ms": layer.memory_time_ms,
+            "latency_ms": layer.dominant_latency_ms,
+            "bytes_gb": layer.bytes_total / 1e9,
+        }
+        for layer in result.layers
+    ]
 
 
 def summary_row(result: SimulationResult) -> dict:
@@ -1,10 +1,12 @@
 """Shared utilities for entrypoint modules."""
 from __future__ import annotations
 
+import copy
+import functools
+import os
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Union
-
-import yaml
+from typing import Callable, Dict, Mapping, Tuple, Union
 
 from core.data import (
     BaseLayerConfig,
@@ -25,12 +27,54 @@ SUPPORTED_LAYER_TYPES = {
 }
 
 
+_YAML_CACHE_SIZE = 128
+# path -> ((st_mtime_ns, st_size), parsed mapping); least recently used entries are evicted first.
+_YAML_CACHE: "OrderedDict[Path, Tuple[Tuple[int, int], Dict]]" = OrderedDict()
+
+
 def read_yaml(path: Path) -> Dict:
+    """Parse a YAML mapping, reusing the previous parse while the file is unchanged.
+
+    Callers get a deep copy, so mutating the result never leaks into later loads.
+    """
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _YAML_CACHE.get(path)
+    if cached is not None and cached[0] == stamp:
+        _YAML_CACHE.move_to_end(path)
+        return copy.deepcopy(cached[1])
+
+    # Imported here so CLI paths that never load a scenario (--help, usage errors) skip PyYAML.
+    import yaml
+
+    # libyaml's C scanner when PyYAML was built with it; same safe constructors either way.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     with path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+        data = yaml.load(handle, Loader=loader) or {}
     if not isinstance(data, dict):
         raise ValueError(f"YAML at {path} must be a mapping")
-    return data
+    _YAML_CACHE[path] = (stamp, data)
+    _YAML_CACHE.move_to_end(path)
+    if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+@functools.lru_cache(maxsize=1024)
+def _realpath(absolute_path: str) -> Path:
+    return Path(os.path.realpath(absolute_path))
+
+
+def resolve_path(path: Union[str, Path]) -> Path:
+    """``Path(path).resolve()`` with the symlink walk memoized per absolute path.
+
+    Relative paths are anchored to the current directory before the cache lookup, so a
+    later ``chdir`` cannot return a stale entry. Symlinks changed mid-process are not seen.
+    """
+    path = os.fspath(path)
+    if not os.path.isabs(path):
+        path = os.path.join(os.getcwd(), path)
+    return _realpath(path)
 
 
 def maybe_load_reference(base_dir: Path, value: Union[str, Dict]) -> Dict:
@@ -38,7 +82,7 @@ def maybe_load_reference(base_dir: Path, value: Union[str, Dict]) -> Dict:
         return value
     if not isinstance(value, str):
         raise ValueError(f"Unsupported reference value: {value!r}")
-    ref_path = (base_dir / value).resolve()
+    ref_path = resolve_path(os.path.join(base_dir, value))
     return read_yaml(ref_path)
 
 
@@ -64,49 +108,64 @@ def hardware_from_dict(data: Dict) -> HardwareSpec:
     )
 
 
-def layer_config_from_dict(idx: int, layer_type: str, data: Dict) -> BaseLayerConfig:
-    canonical_type = SUPPORTED_LAYER_TYPES.get(layer_type)
-    if canonical_type is None:
-        raise ValueError(f"Unsupported layer type: {layer_type}")
-
-    name = data.get("name") or f"{canonical_type}_{idx}"
-    attn_config = data.get("attn_config", {})
-
-    if canonical_type == "ffn":
-        ffn_config = data.get("ffn_config", {})
-        return FFNLayerConfig(
-            layer_type="ffn",
-            name=name,
-            layer_id=idx,
-            attn_config=attn_config,
-            ffn_config=ffn_config,
-        )
-    if canonical_type == "moe":
-        moe_config = data.get("moe_config", {})
-        return MoELayerConfig(
-            layer_type="moe",
-            name=name,
-            layer_id=idx,
-            attn_config=attn_config,
-            moe_config=moe_config,
-        )
-    if canonical_type == "communication":
-        comm_config = data.get("comm_config", data)
-        return CommunicationLayerConfig(
-            layer_type="communication",
-            name=name,
-            layer_id=idx,
-            attn_config=attn_config,
-            comm_config=comm_config,
-        )
+def _make_attention(idx: int, name: str, data: Mapping) -> BaseLayerConfig:
     return BaseLayerConfig(
         layer_type="attention",
         name=name,
         layer_id=idx,
-        attn_config=attn_config or data,
+        attn_config=data.get("attn_config", {}) or dict(data),
+    )
+
+
+def _make_ffn(idx: int, name: str, data: Mapping) -> BaseLayerConfig:
+    return FFNLayerConfig(
+        layer_type="ffn",
+        name=name,
+        layer_id=idx,
+        attn_config=data.get("attn_config", {}),
+        ffn_config=data.get("ffn_config", {}),
+    )
+
+
+def _make_moe(idx: int, name: str, data: Mapping) -> BaseLayerConfig:
+    return MoELayerConfig(
+        layer_type="moe",
+        name=name,
+        layer_id=idx,
+        attn_config=data.get("attn_config", {}),
+        moe_config=data.get("moe_config", {}),
+    )
+
+
+def _make_communication(idx: int, name: str, data: Mapping) -> BaseLayerConfig:
+    return CommunicationLayerConfig(
+        layer_type="communication",
+        name=name,
+        layer_id=idx,
+        attn_config=data.get("attn_config", {}),
+        comm_config=data["comm_config"] if "comm_config" in data else dict(data),
     )
 
 
+# Canonical layer type -> config constructor; one dict lookup instead of an if/elif chain.
+_LAYER_CTORS: Dict[str, Callable[[int, str, Mapping], BaseLayerConfig]] = {
+    "attention": _make_attention,
+    "ffn": _make_ffn,
+    "moe": _make_moe,
+    "communication": _make_communication,
+}
+
+
+def layer_config_from_dict(idx: int, layer_type: str, data: Mapping) -> BaseLayerConfig:
+    try:
+        canonical_type = SUPPORTED_LAYER_TYPES[layer_type]
+    except KeyError:
+        raise ValueError(f"Unsupported layer type: {layer_type}") from None
+
+    name = data.get("name") or f"{canonical_type}_{idx}"
+    return _LAYER_CTORS[canonical_type](idx, name, data)
+
+
 def format_ms(value: float) -> str:
     return f"{value:8.3f}"
 
@@ -123,6 +182,7 @@ __all__ = [
     "SUPPORTED_LAYER_TYPES",
     "read_yaml",
     "maybe_load_reference",
+    "resolve_path",
     "hardware_from_dict",
     "layer_config_from_dict",
     "format_ms",
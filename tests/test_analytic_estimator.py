@@ -0,0 +1,196 @@
+import dataclasses
+
+import pytest
+
+from core.data import (
+    BaseLayerConfig,
+    CommunicationLayerConfig,
+    FFNLayerConfig,
+    HardwareSpec,
+    MoELayerConfig,
+    RuntimeSpec,
+)
+from core.estimation import AnalyticEstimator
+
+
+def _hardware() -> HardwareSpec:
+    return HardwareSpec(
+        name="TestGPU",
+        peak_tflops=150,
+        memory_bandwidth_gbps=1555,
+        hbm_gb=80,
+        interconnect_gbps=600,
+    )
+
+
+def _layers():
+    attn = {"d_model": 256, "num_attention_heads": 8}
+    layers = []
+    for idx in range(4):
+        layers.append(BaseLayerConfig(layer_type="attention", name=f"attn_{idx}", layer_id=idx, attn_config=dict(attn)))
+        layers.append(
+            FFNLayerConfig(
+                layer_type="ffn",
+                name=f"ffn_{idx}",
+                layer_id=idx,
+                attn_config=dict(attn),
+                ffn_config={"d_model": 256, "d_ff": 1024},
+            )
+        )
+    layers.append(
+        MoELayerConfig(
+            layer_type="moe",
+            name="moe_0",
+            layer_id=4,
+            attn_config=dict(attn),
+            moe_config={"d_model": 256, "moe_intermediate_size": 512, "n_routed_experts": 8, "num_experts_per_tok": 2},
+        )
+    )
+    return layers
+
+
+def test_repeated_layers_share_modules():
+    estimator = AnalyticEstimator(_hardware(), RuntimeSpec(batch_size=2, seq_len=64))
+    executions = estimator.estimate_layers(_layers())
+
+    assert len(executions) == 9
+    assert len(estimator._modules) == 3
+    assert executions[0].flops == executions[2].flops
+    assert executions[0].layer_name == "attn_0"
+    assert executions[2].layer_name == "attn_1"
+    assert executions[0].features["layer_id"] == 0.0
+    assert executions[2].features["layer_id"] == 1.0
+
+
+def test_in_place_config_edits_are_not_served_stale():
+    runtime = RuntimeSpec(batch_size=2, seq_len=64)
+    estimator = AnalyticEstimator(_hardware(), runtime)
+    layer = _layers()[1]
+    before = estimator.estimate_layer(layer).flops
+
+    layer.ffn_config["d_ff"] = 2048
+    edited = FFNLayerConfig(layer_type="ffn", name="ffn_0", layer_id=0, ffn_config=dict(layer.ffn_config))
+    expected = AnalyticEstimator(_hardware(), runtime).estimate_layer(edited).flops
+
+    assert expected != before
+    assert estimator.estimate_layer(layer).flops == expected
+    assert AnalyticEstimator(_hardware(), runtime).estimate_layer(layer).flops == expected
+
+
+def test_batched_matches_scalar_path():
+    layers = _layers()
+    layers.append(
+        BaseLayerConfig(
+            layer_type="attention",
+            name="attn_unfused",
+            layer_id=6,
+            attn_config={"d_model": 256, "num_attention_heads": 8, "fused_qkv": False, "fused_attention": False},
+        )
+    )
+    layers.append(
+        BaseLayerConfig(
+            layer_type="attention",
+            name="attn_quantized",
+            layer_id=6,
+            attn_config={"d_model": 256, "num_attention_heads": 8, "weight_bits": 4, "kv_bits": 8},
+        )
+    )
+    for level, fused_attention in ((1, True), (2, False)):
+        layers.append(
+            BaseLayerConfig(
+                layer_type="attention",
+                name=f"attn_kernel_fused_{level}",
+                layer_id=6,
+                attn_config={
+                    "d_model": 256,
+                    "num_attention_heads": 8,
+                    "fused_attention": fused_attention,
+                    "kernel_fusion_level": level,
+                },
+            )
+        )
+    ffn_variants = (
+        {"activation": "gelu"},
+        {"gate_fused": False},
+        {"weight_bits": 8},
+        {"gate_fused": False, "kernel_fusion_level": 1},
+    )
+    for idx, ffn_extra in enumerate(ffn_variants):
+        layers.append(
+            FFNLayerConfig(
+                layer_type="ffn",
+                name=f"ffn_variant_{idx}",
+                layer_id=7 + idx,
+                ffn_config={"d_model": 256, "d_ff": 1024, **ffn_extra},
+            )
+        )
+    layers.append(
+        CommunicationLayerConfig(
+            layer_type="communication",
+            name="comm_0",
+            layer_id=5,
+            comm_config={"pattern": "all_reduce", "payload_mb": 4.0},
+        )
+    )
+    estimator = AnalyticEstimator(_hardware(), RuntimeSpec(batch_size=2, seq_len=64))
+    scalar = estimator.estimate_layers(layers)
+    batched = estimator.estimate_layers_batched(layers)
+
+    assert [layer.layer_name for layer in batched] == [layer.layer_name for layer in scalar]
+    for expected, actual in zip(scalar, batched):
+        assert actual.flops == pytest.approx(expected.flops)
+        assert actual.bytes_read == pytest.approx(expected.bytes_read)
+        assert actual.bytes_written == pytest.approx(expected.bytes_written)
+        assert expected.bytes_total == expected.bytes_read + expected.bytes_written
+        assert actual.bytes_total == pytest.approx(expected.bytes_total)
+        assert actual.dominant_latency_ms == pytest.approx(expected.dominant_latency_ms)
+        assert actual.breakdown.keys() == expected.breakdown.keys()
+        for name, entry in expected.breakdown.items():
+            assert actual.breakdown[name] == pytest.approx(entry)
+        assert actual.features == expected.features
+        assert dataclasses.asdict(actual) == dataclasses.asdict(expected)
+
+
+def test_compiled_model_retimes_across_hardware():
+    layers = _layers()
+    runtime = RuntimeSpec(batch_size=2, seq_len=64)
+    compiled = AnalyticEstimator(_hardware(), runtime).compile(layers)
+    faster = HardwareSpec(
+        name="FasterGPU",
+        peak_tflops=300,
+        memory_bandwidth_gbps=3000,
+        hbm_gb=80,
+        interconnect_gbps=900,
+    )
+
+    expected = AnalyticEstimator(faster, runtime).estimate_layers(layers)
+    actual = compiled.evaluate(faster)
+
+    assert len(compiled) == len(layers)
+    for exp, act in zip(expected, actual):
+        assert act.dominant_latency_ms == pytest.approx(exp.dominant_latency_ms)
+        assert act.compute_time_ms == pytest.approx(exp.compute_time_ms)
+
+
+def test_batched_matches_scalar_with_tokens_per_expert():
+    runtime = RuntimeSpec(batch_size=2, seq_len=64, tokens_per_expert=3.5)
+    estimator = AnalyticEstimator(_hardware(), runtime)
+    layers = _layers()
+
+    scalar = estimator.estimate_layers(layers)
+    batched = estimator.estimate_layers_batched(layers)
+
+    assert [layer.to_dict() for layer in batched] == [layer.to_dict() for layer in scalar]
+
+
+def test_compiled_evaluate_defers_dicts_without_sharing_state():
+    compiled = AnalyticEstimator(_hardware(), RuntimeSpec(batch_size=2, seq_len=64)).compile(_layers())
+    first = compiled.evaluate(_hardware())[0]
+
+    first.features["layer_id"] = -1.0
+    first.breakdown.clear()
+    second = compiled.evaluate(_hardware())[0]
+
+    assert second.features["layer_id"] == 0.0
+    assert second.breakdown == compiled.breakdowns[0].breakdown()
+
@@ -1,5 +1,7 @@
 from core.data import HardwareSpec
 from core.module.attention import Attention
+from core.module.communication import Communication
+from core.module.ffn import FFN
 
 
 def test_attention_estimate_execution():
@@ -17,3 +19,30 @@ def test_attention_estimate_execution():
     assert execution.flops > 0
     assert execution.compute_time_ms > 0
     assert execution.dominant_latency_ms >= execution.compute_time_ms
+
+
+def test_attention_from_config_matches_dict_constructor():
+    attn = Attention({"d_model": 128, "num_attention_heads": 8, "fused_qkv": False})
+    rebuilt = Attention.from_config(attn.config)
+
+    assert rebuilt.config is attn.config
+    assert rebuilt.analytic_flops(2, 64) == attn.analytic_flops(2, 64)
+
+
+def test_modules_still_accept_a_positional_hardware_config():
+    hardware_cfg = {"name": "TestGPU"}
+
+    attn = Attention({"d_model": 128, "num_attention_heads": 8}, hardware_cfg)
+    assert attn.analytic_flops(2, 64) == Attention({"d_model": 128, "num_attention_heads": 8}).analytic_flops(2, 64)
+    assert FFN({"d_model": 128, "d_ff": 512}, hardware_cfg).config == FFN({"d_model": 128, "d_ff": 512}).config
+    assert Communication({"pattern": "all_reduce"}, hardware_cfg).config.pattern == "all_reduce"
+
+
+def test_kernel_fusion_level_elides_intermediate_traffic():
+    base = {"d_model": 128, "num_attention_heads": 8, "fused_attention": False}
+    levels = [Attention({**base, "kernel_fusion_level": level}) for level in (0, 1, 2)]
+    flops = [attn.analytic_flops(2, 64) for attn in levels]
+    bytes_read = [attn._metrics(2, 64).total_bytes for attn in levels]
+
+    assert flops[0] == flops[1] == flops[2]
+    assert bytes_read[0] > bytes_read[1] > bytes_read[2]
@@ -1,6 +1,12 @@
+import argparse
+import json
+import subprocess
+import sys
 from pathlib import Path
 
+from core.data import RuntimeSpec
 from entrypoints import cli
+from entrypoints.simulator import load_scenario, run_simulation
 
 
 def _write_basic_files(tmp_path: Path) -> Path:
@@ -72,3 +78,74 @@ def test_unified_cli_large_ep(monkeypatch, tmp_path, capsys):
     out = capsys.readouterr().out
     assert "Scenario:" in out
     assert "Total latency" in out
+
+
+def test_build_parser_only_materializes_selected_workflow(monkeypatch):
+    built = []
+    make_builder = cli._build_workflow_parser
+
+    def recording_builder(key, definition):
+        build = make_builder(key, definition)
+
+        def record(workflow_parser):
+            built.append(key)
+            build(workflow_parser)
+
+        return record
+
+    monkeypatch.setattr(cli, "_build_workflow_parser", recording_builder)
+    cli._reset_parser_cache()
+    parser = cli.build_parser()
+    workflows = parser._subparsers._group_actions[0]
+
+    args = parser.parse_args(["afd", "simulate", "scenario.yaml", "--batch", "1", "--seq", "8"])
+
+    assert args.workflow == "afd"
+    assert args.handler is cli._run_simulation
+    assert built == ["afd"]
+    assert sorted(workflows.choices) == ["afd", "large-ep"]
+
+    assert all(isinstance(sub, argparse.ArgumentParser) for sub in workflows.choices.values())
+    assert built == ["afd", "large-ep"]
+    cli._reset_parser_cache()
+
+
+def test_help_skips_yaml_and_estimator_imports():
+    code = (
+        "import sys\n"
+        "from entrypoints import cli\n"
+        "try:\n"
+        "    cli.main(['afd', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in ('yaml', 'core.estimation') if m in sys.modules))\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+
+    assert out.strip().splitlines()[-1] == "[]"
+
+
+def test_build_parser_is_shared_until_reset():
+    parser = cli.build_parser()
+    assert cli.build_parser() is parser
+
+    first = parser.parse_args(["afd", "simulate", "a.yaml", "--batch", "1", "--seq", "8"])
+    second = parser.parse_args(["large-ep", "evaluate", "b.yaml", "--batch", "2", "--seq", "4"])
+    assert (first.workflow, first.scenario, first.batch) == ("afd", "a.yaml", 1)
+    assert (second.workflow, second.command, second.seq) == ("large-ep", "evaluate", 4)
+
+    cli._reset_parser_cache()
+    assert cli.build_parser() is not parser
+
+
+def test_unified_cli_writes_json_output(monkeypatch, tmp_path, capsys):
+    scenario = _write_basic_files(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    cli.main(["afd", "simulate", str(scenario.name), "--batch", "2", "--seq", "16", "--output", "result.json"])
+
+    result = json.loads((tmp_path / "result.json").read_text())
+    expected = run_simulation(load_scenario(scenario.name), RuntimeSpec(batch_size=2, seq_len=16))
+    assert result == expected.to_dict()
+    assert [layer["layer_name"] for layer in result["layers"]] == ["ffn_0"]
+    assert result["bottleneck_layer"] == "ffn_0"
@@ -1,8 +1,11 @@
 from pathlib import Path
 
-from core.data import RuntimeSpec
+import pytest
+
+from core.data import CommunicationLayerConfig, FFNLayerConfig, MoELayerConfig, RuntimeSpec
 from core.estimation import AnalyticEstimator
-from entrypoints.simulator import load_scenario, run_simulation
+from entrypoints.simulator import layer_table, load_scenario, run_simulation
+from entrypoints.utils import layer_config_from_dict, read_yaml, resolve_path
 
 
 def test_scenario_loading_and_simulation(tmp_path: Path):
@@ -53,3 +56,91 @@ layers:
     assert result.total_latency_ms > 0
     assert result.total_flops > 0
     assert result.bottleneck_layer == scenario.layers[0].name
+
+    (row,) = layer_table(result)
+    layer = result.layers[0]
+    assert row == {
+        "layer": layer.layer_name,
+        "type": "ffn",
+        "gflops": layer.flops / 1e9,
+        "compute_ms": layer.compute_time_ms,
+        "memory_ms": layer.memory_time_ms,
+        "latency_ms": layer.dominant_latency_ms,
+        "bytes_gb": (layer.bytes_read + layer.bytes_written) / 1e9,
+    }
+
+    totals_only = run_simulation(scenario, runtime, estimator=estimator, keep_layers=False)
+    assert totals_only.layers == []
+    assert totals_only.to_dict() | {"layers": result.to_dict()["layers"]} == result.to_dict()
+
+
+def test_read_yaml_cache_returns_copies_and_tracks_edits(tmp_path: Path):
+    config = tmp_path / "config.yaml"
+    config.write_text("d_model: 128\n")
+
+    first = read_yaml(config)
+    first["d_model"] = 0
+    assert read_yaml(config) == {"d_model": 128}
+
+    config.write_text("d_model: 256\nd_ff: 1024\n")
+    assert read_yaml(config) == {"d_model": 256, "d_ff": 1024}
+
+
+def test_resolve_path_matches_pathlib_across_chdir(tmp_path: Path, monkeypatch):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "a")
+
+    monkeypatch.chdir(tmp_path / "a")
+    assert resolve_path("x.yaml") == Path("x.yaml").resolve() == (tmp_path / "a" / "x.yaml").resolve()
+    monkeypatch.chdir(tmp_path / "b")
+    assert resolve_path("x.yaml") == (tmp_path / "b" / "x.yaml").resolve()
+    assert resolve_path(tmp_path / "link" / ".." / "b") == (tmp_path / "link" / ".." / "b").resolve()
+
+
+def test_layer_config_from_dict_dispatches_on_canonical_type():
+    assert isinstance(layer_config_from_dict(0, "ffn_layer", {"ffn_config": {"d_ff": 8}}), FFNLayerConfig)
+    assert isinstance(layer_config_from_dict(1, "moe", {}), MoELayerConfig)
+    comm = layer_config_from_dict(2, "communication", {"pattern": "all_reduce"})
+    assert isinstance(comm, CommunicationLayerConfig)
+    assert comm.comm_config == {"pattern": "all_reduce"}
+    attn = layer_config_from_dict(3, "attention_layer", {"d_model": 64})
+    assert (attn.layer_type, attn.name, attn.attn_config) == ("attention", "attention_3", {"d_model": 64})
+
+    with pytest.raises(ValueError, match="Unsupported layer type"):
+        layer_config_from_dict(4, "conv", {})
+
+
+def test_load_scenario_layer_overrides_and_names(tmp_path: Path):
+    (tmp_path / "hardware.yaml").write_text(
+        "name: TestGPU\npeak_tflops: 120\nmemory_bandwidth_gbps: 1500\nhbm_gb: 80\ninterconnect_gbps: 600\n"
+    )
+    (tmp_path / "ffn.yaml").write_text("name: from_file\nffn_config:\n  d_model: 128\n  d_ff: 512\n")
+    (tmp_path / "attn.yaml").write_text("d_model: 128\nnum_attention_heads: 8\n")
+    scenario_yaml = tmp_path / "scenario.yaml"
+    scenario_yaml.write_text(
+        """
+hardware: hardware.yaml
+layers:
+  - type: ffn_layer
+    config: ffn.yaml
+  - type: ffn_layer
+    config: ffn.yaml
+    overrides:
+      name: overridden
+      ffn_config: {d_model: 128, d_ff: 256}
+  - type: attention
+    name: from_entry
+    config: attn.yaml
+  - type: communication
+    pattern: all_reduce
+"""
+    )
+
+    layers = load_scenario(scenario_yaml).layers
+
+    assert [layer.name for layer in layers] == ["from_file", "overridden", "from_entry", "communication_3"]
+    assert layers[1].ffn_config == {"d_model": 128, "d_ff": 256}
+    assert layers[2].attn_config["num_attention_heads"] == 8
+    assert type(layers[2].attn_config) is dict
+    assert layers[3].comm_config["pattern"] == "all_reduce"
@@ -0,0 +1,16 @@
+from core.module.ffn import FFN
+
+
+def test_ffn_hidden_act_selects_activation_when_activation_is_unset():
+    base = {"d_model": 256, "d_ff": 1024}
+
+    assert FFN({**base, "hidden_act": "silu"}).config.activation == "swiglu"
+    assert FFN({**base, "hidden_act": "SwiGLU"}).config.activation == "swiglu"
+    assert FFN({**base, "hidden_act": "gelu", "activation": "swiglu"}).config.activation == "swiglu"
+    assert FFN(base).config.activation == "swiglu"
+
+    gelu = FFN({**base, "hidden_act": "gelu"})
+    classic = FFN({**base, "activation": "gelu"})
+    assert gelu.config.activation == "gelu"
+    assert gelu.analytic_flops(2, 64) == classic.analytic_flops(2, 64)
+    assert gelu.analytic_flops(2, 64) < FFN(base).analytic_flops(2, 64)
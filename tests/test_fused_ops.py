@@ -0,0 +1,74 @@
+from core.ops import (
+    FusionMetricsBatch,
+    attention_flash,
+    attention_qkv_projections,
+    attention_scores,
+    attention_weighted_sum,
+    ffn_activation,
+    ffn_activation_swiglu,
+    ffn_activation_swiglu_fused,
+    tensor_bytes,
+)
+
+
+def test_fused_qkv_streams_input_once():
+    fused = attention_qkv_projections(2, 64, 256, 256)
+    unfused = attention_qkv_projections(2, 64, 256, 256, fused=False)
+
+    assert fused.name == "attention_qkv_proj_fused"
+    assert unfused.name == "attention_qkv_proj"
+    assert fused.flops == unfused.flops
+    input_bytes = 2 * 64 * 256 * 2
+    assert unfused.bytes_accessed - fused.bytes_accessed == 2 * input_bytes
+
+
+def test_flash_attention_skips_score_matrix_traffic():
+    flash = attention_flash(2, 512, 8, 64)
+    scores = attention_scores(2, 512, 8, 64)
+    weighted = attention_weighted_sum(2, 512, 8, 64)
+
+    assert flash.flops == scores.flops + weighted.flops
+    attn_bytes = tensor_bytes((2, 8, 512, 512))
+    assert scores.bytes_accessed + weighted.bytes_accessed - flash.bytes_accessed == 2 * attn_bytes
+
+
+def test_swiglu_counts_three_matmuls_and_gate_fusion_saves_traffic():
+    plain = ffn_activation(2, 64, 256, 1024)
+    swiglu = ffn_activation_swiglu(2, 64, 256, 1024)
+    fused = ffn_activation_swiglu_fused(2, 64, 256, 1024)
+
+    tokens = 2 * 64
+    assert swiglu.flops - plain.flops == 2 * tokens * 1024 * 256
+    assert fused.flops == swiglu.flops
+    assert fused.name == "ffn_swiglu_fused"
+    saved = tensor_bytes((2, 64, 256)) + 2 * tensor_bytes((2, 64, 1024))
+    assert swiglu.bytes_accessed - fused.bytes_accessed == saved
+
+
+def test_quantized_weights_shrink_weight_traffic_and_add_dequant_flops():
+    full = ffn_activation(2, 64, 256, 1024)
+    int8 = ffn_activation(2, 64, 256, 1024, weight_bits=8)
+
+    weight_elements = 2 * 256 * 1024
+    assert full.bytes_accessed - int8.bytes_accessed == weight_elements * (16 - 8) / 8
+    assert int8.flops - full.flops == 2 * weight_elements
+
+
+def test_kv_bits_only_change_kv_traffic():
+    full = attention_flash(2, 128, 8, 64)
+    fp8_kv = attention_flash(2, 128, 8, 64, kv_bits=8)
+
+    assert fp8_kv.flops == full.flops
+    kv_bytes = 2 * tensor_bytes((2, 8, 128, 64), 16)
+    assert full.bytes_accessed - fp8_kv.bytes_accessed == kv_bytes / 2
+
+
+def test_fusion_metrics_batch_round_trips_single_ops():
+    ops = (attention_qkv_projections(2, 64, 256, 256), attention_flash(2, 64, 8, 32))
+    batch = FusionMetricsBatch.from_metrics(ops)
+
+    assert len(batch) == 2
+    assert batch[1] == ops[1]
+    assert list(batch) == list(ops)
+    assert float(batch.flops.sum()) == ops[0].flops + ops[1].flops
+    assert batch.breakdown()["attention_flash"] == {"flops": ops[1].flops, "bytes": ops[1].bytes_accessed}
@@ -1,10 +1,21 @@
+import copy
+import dataclasses
+import pickle
+
+import numpy as np
+import pytest
+
 from core.data import HardwareSpec
 from core.ops.metrics import (
     compute_time_ms,
     dominant_latency_ms,
+    interconnect_time_ms,
+    layer_latencies_ms,
+    layer_times_ms,
     matmul_flops,
     memory_time_ms,
     tensor_bytes,
+    tensor_bytes_many,
 )
 
 
@@ -13,6 +24,13 @@ def test_matmul_and_tensor_bytes():
     assert tensor_bytes((2, 2), dtype_bits=32) == 16
 
 
+def test_tensor_bytes_many_matches_scalar():
+    shapes = [(2, 3, 4, 1), (8, 16, 1, 1), (4, -1, 2, 1)]
+    expected = [tensor_bytes(shape, dtype_bits=16) for shape in shapes]
+
+    assert tensor_bytes_many(np.array(shapes), 16).tolist() == expected
+
+
 def test_timing_helpers():
     hardware = HardwareSpec(
         name="TestGPU",
@@ -28,3 +46,66 @@ def test_timing_helpers():
     assert compute_ms > 0
     assert memory_ms > 0
     assert latency_ms >= max(compute_ms, memory_ms / hardware.effective_overlap())
+
+
+def test_hardware_rate_cache_stays_out_of_public_fields():
+    hardware = HardwareSpec(
+        name="TestGPU",
+        peak_tflops=100,
+        memory_bandwidth_gbps=1000,
+        hbm_gb=80,
+        interconnect_gbps=600,
+    )
+
+    assert list(dataclasses.asdict(hardware)) == [
+        "name",
+        "peak_tflops",
+        "memory_bandwidth_gbps",
+        "hbm_gb",
+        "interconnect_gbps",
+        "max_concurrency",
+        "overlap_efficiency",
+    ]
+    for clone in (copy.deepcopy(hardware), pickle.loads(pickle.dumps(hardware))):
+        assert clone == hardware
+        assert compute_time_ms(2e12, clone) == compute_time_ms(2e12, hardware)
+        assert interconnect_time_ms(1e9, clone) == interconnect_time_ms(1e9, hardware)
+
+
+def test_layer_times_matches_individual_helpers():
+    hardware = HardwareSpec(
+        name="TestGPU",
+        peak_tflops=100,
+        memory_bandwidth_gbps=1000,
+        hbm_gb=80,
+        interconnect_gbps=600,
+        overlap_efficiency=0.8,
+    )
+    compute_ms = compute_time_ms(3e12, hardware)
+    memory_ms = memory_time_ms(5e11, hardware)
+
+    assert layer_times_ms(3e12, 5e11, hardware) == pytest.approx(
+        (compute_ms, memory_ms, dominant_latency_ms(compute_ms, memory_ms, hardware))
+    )
+
+
+def test_layer_latencies_match_scalar_helpers():
+    hardware = HardwareSpec(
+        name="TestGPU",
+        peak_tflops=100,
+        memory_bandwidth_gbps=1000,
+        hbm_gb=80,
+        interconnect_gbps=600,
+        overlap_efficiency=0.8,
+    )
+    flops = np.array([3e12, 1e9, 0.0])
+    memory_bytes = np.array([5e11, 4e9, 2e8])
+    interconnect_bound = np.array([False, False, True])
+
+    compute_ms, memory_ms, latency_ms = layer_latencies_ms(flops, memory_bytes, interconnect_bound, hardware)
+
+    for i in range(2):
+        assert (compute_ms[i], memory_ms[i], latency_ms[i]) == layer_times_ms(flops[i], memory_bytes[i], hardware)
+    ic_ms = interconnect_time_ms(2e8, hardware)
+    mem_ms = memory_time_ms(2e8, hardware)
+    assert (compute_ms[2], memory_ms[2], latency_ms[2]) == (ic_ms, mem_ms, dominant_latency_ms(ic_ms, mem_ms, hardware))
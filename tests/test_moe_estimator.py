@@ -1,4 +1,6 @@
-from core.data import HardwareSpec
+import pytest
+
+from core.data import HardwareSpec, RuntimeSpec
 from core.module.moe import MoE
 
 
@@ -23,3 +25,26 @@ def test_moe_estimate_execution():
     assert execution.layer_name == "moe"
     assert execution.flops > 0
     assert execution.dominant_latency_ms >= execution.compute_time_ms
+
+
+def test_moe_tokens_per_expert_overrides_average_load():
+    moe_config = {"d_model": 256, "moe_intermediate_size": 512, "n_routed_experts": 16, "num_experts_per_tok": 2}
+    estimated = MoE(moe_config)
+    calibrated = MoE(moe_config, runtime=RuntimeSpec(batch_size=2, seq_len=64, tokens_per_expert=4.0))
+
+    # 2 * 64 tokens * 2 experts each = 256 expert-tokens vs 4 * 16 = 64 from the runtime.
+    expert = estimated._metrics(2, 64)[1]
+    calibrated_expert = calibrated._metrics(2, 64)[1]
+    assert expert.flops == 4 * calibrated_expert.flops
+
+
+def test_moe_runtime_is_keyword_only():
+    moe_config = {"d_model": 256, "moe_intermediate_size": 512, "n_routed_experts": 16, "num_experts_per_tok": 2}
+    runtime = RuntimeSpec(batch_size=2, seq_len=64, tokens_per_expert=4.0)
+
+    with_hw_dict = MoE(moe_config, {"name": "TestGPU"})
+    assert with_hw_dict.tokens_per_expert is None
+    assert with_hw_dict.analytic_flops(2, 64) == MoE(moe_config).analytic_flops(2, 64)
+    with pytest.raises(TypeError):
+        MoE.from_config(with_hw_dict.config, runtime)
+    assert MoE.from_config(with_hw_dict.config, runtime=runtime).tokens_per_expert == 4.0